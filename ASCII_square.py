@@ -1,29 +1,298 @@
+import io
 from functools import lru_cache
-from timer_wrapper import timer
+from importlib.machinery import PathFinder
+from ascii_square_cache import translated_square_cache
+from timer_wrapper import timer, cold_path
+
+
+# NumPy is optional: when it is installed squares are built by the vectorized engine
+FAST_ENGINE_AVAILABLE = PathFinder.find_spec("numpy") is not None  # Found without importing it
+
+FAST_ENGINE_MIN_SIZE = 512  # Smaller squares are built faster in pure Python than NumPy can even be imported
+NUMPY_BLOCK_ROWS = 1024  # Rows per vectorized block; bounds the temporary offset matrix
+
+ALLOWED_CHARACTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"  # A-Z then a-z
+
+SQUARE_CACHE_BYTES = 256 * 1024 * 1024  # Byte budget of the cache of canonical squares
+
+ALPHABET_CACHE_SIZE = 32  # Alphabets whose character lookups stay compiled
+OFFSETS_CACHE_SIZE = 16  # Dimensions whose offset vectors stay shared between requests
+OFFSETS_CACHE_MAX_SIZE = 20000  # Longer dimensions, beyond any valid square, get their offsets built per request
+
+square_store = None  # Optional SquareStore shared across processes, see configure_square_store
 
 
 @timer
-@lru_cache(maxsize=128)
+@translated_square_cache(ALLOWED_CHARACTERS, max_bytes=SQUARE_CACHE_BYTES)
+@cold_path
 def ascii_square_construction(square_size, starting_character="A") -> str:
-    # Define the allowed characters: A-Z then a-z.
-    allowed_chars = [chr(i) for i in range(ord("A"), ord("Z") + 1)] + \
-                    [chr(i) for i in range(ord("a"), ord("z") + 1)]
-    total_letters = len(allowed_chars)  # 52
+    start_index = character_index(starting_character)
+    if square_store is not None:
+        stored = square_store.get(square_size, start_index)
+        if stored is not None:
+            with stored:
+                return stored.text()  # Warm start from disk, no construction needed
+
+    square = build_square(square_size, starting_character)
+
+    if square_store is not None:
+        square_store.put(square_size, start_index, square)
+    return square  # Return a constructed square
+
+
+@timer
+def ascii_rectangle_construction(rows, columns, starting_character="A", alphabet=ALLOWED_CHARACTERS) -> str:
+    """
+        Construct a rows x columns rectangle whose rings cycle through alphabet from starting_character.
+        Squares over the default alphabet are served by ascii_square_construction and its cache.
+    """
+    if rows == columns and alphabet == ALLOWED_CHARACTERS:
+        return ascii_square_construction(rows, starting_character)
+    return build_rectangle(rows, columns, starting_character, alphabet)
+
+
+def build_square(square_size, starting_character="A") -> str:
+    """
+        Construct the square text directly, without the cache, the store or timing.
+    """
+    return build_rectangle(square_size, square_size, starting_character)
+
+
+def build_rectangle(rows, columns, starting_character="A", alphabet=ALLOWED_CHARACTERS) -> str:
+    """
+        Construct the rectangle text directly, without caching or timing.
+    """
+    row_offsets, column_offsets, ascii_map = rectangle_offsets_and_map(rows, columns, starting_character, alphabet)
+
+    if FAST_ENGINE_AVAILABLE and rows * columns >= FAST_ENGINE_MIN_SIZE ** 2 and alphabet.isascii():
+        return numpy_rectangle_construction(row_offsets, column_offsets, ascii_map)
+
+    # The rectangle is symmetric, so only the top half of the rows is built; the bottom half reuses those rows
+    top_rows = [mirrored_row(row_offset, columns, ascii_map) for row_offset in row_offsets[:(rows + 1) // 2]]
+    return "\n".join(top_rows + top_rows[:rows // 2][::-1])
+
+
+def build_square_into(buffer, square_size, starting_character="A"):
+    """
+        Write the square as ASCII bytes, followed by one newline, into a writable buffer of 2 * n * n bytes
+        such as a SharedMemory block, without building it as a str first.
+    """
+    offsets, ascii_map = square_offsets_and_map(square_size, starting_character)
+    stride = 2 * square_size  # Bytes per row including its newline
+
+    if FAST_ENGINE_AVAILABLE and square_size >= FAST_ENGINE_MIN_SIZE:
+        import numpy as np
+
+        numpy_rectangle_fill(np.ndarray((square_size, stride), dtype=np.uint8, buffer=buffer), offsets, offsets,
+                             ascii_map)
+        return
+
+    with memoryview(buffer) as view:
+        for index, row_offset in enumerate(offsets[:(square_size + 1) // 2]):
+            row = (mirrored_row(row_offset, square_size, ascii_map) + "\n").encode("ascii")
+            view[index * stride:(index + 1) * stride] = row
+            mirrored_index = square_size - 1 - index  # The bottom half repeats the top rows
+            view[mirrored_index * stride:(mirrored_index + 1) * stride] = row
+
+
+def configure_square_store(directory, max_bytes=1024 * 1024 * 1024):
+    """
+        Persist built squares in a SquareStore at directory (None disables the store).
+        Later processes then memory-map stored squares instead of constructing them.
+    """
+    global square_store
+    from ascii_square_store import SquareStore  # Imported on demand to keep plain imports fast
+    square_store = SquareStore(directory, max_bytes) if directory is not None else None
+    return square_store
+
+
+def stored_square(square_size, starting_character="A"):
+    """
+        Return the square as a memory-mapped StoredSquare from the configured store, building and
+        storing it first if needed. Its rows are zero-copy views; close it when done.
+        Raises ValueError for squares larger than the store's whole byte budget.
+    """
+    if square_store is None:
+        raise RuntimeError("No square store is configured; call configure_square_store first.")
+    if not square_store.fits(square_size):
+        raise ValueError(f"A square of size {square_size} does not fit the store's budget of "
+                         f"{square_store.max_bytes} bytes.")
+    start_index = character_index(starting_character)
+    stored = square_store.get(square_size, start_index)
+    if stored is None:
+        square_store.put(square_size, start_index, ascii_square_construction(square_size, starting_character))
+        stored = square_store.get(square_size, start_index)
+        if stored is None:
+            raise RuntimeError(f"The square of size {square_size} was evicted by another process before it was mapped.")
+    return stored
+
+
+def iter_rows(square_size, starting_character="A"):
+    """
+        Yield the rows of the square one at a time, without building the whole square.
+        Only the offsets and the character mapping are kept, so memory stays O(n) for any size.
+    """
+    offsets, ascii_map = square_offsets_and_map(square_size, starting_character)
+    for row_offset in offsets:
+        yield mirrored_row(row_offset, square_size, ascii_map)
+
+
+def write_square(square_size, starting_character, fileobj, chunk_rows=256):
+    """
+        Stream the square to a file, pipe or socket, chunk_rows rows per write.
+        The written text is identical to ascii_square_construction's result.
+        Text streams receive str, binary streams and sockets receive ASCII bytes.
+    """
+    if isinstance(fileobj, io.TextIOBase):
+        write = fileobj.write
+    else:
+        raw_write = getattr(fileobj, "write", None) or fileobj.sendall
+        write = lambda text: raw_write(text.encode("ascii"))
+
+    chunk = []
+    separator = ""  # Rows are separated by newlines, with no newline after the last row
+    for row in iter_rows(square_size, starting_character):
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            write(separator + "\n".join(chunk))
+            separator = "\n"
+            chunk = []
+    if chunk:
+        write(separator + "\n".join(chunk))
+
+
+def cell(square_size, starting_character, row, column) -> str:
+    """
+        Return the character at (row, column) straight from the min-distance-to-border formula.
+    """
+    if not (0 <= row < square_size and 0 <= column < square_size):
+        raise IndexError(f"Cell ({row}, {column}) is outside a square of size {square_size}.")
+    offset = min(row, column, square_size - 1 - row, square_size - 1 - column)
+    return offset_character(starting_character, offset)
+
+
+def viewport(square_size, starting_character, first_row, first_column, rows, columns):
+    """
+        Return the rows of a rectangular window of the square, formatted like the square's own rows.
+        The window is clipped to the square, and its cost is proportional to its area, not to the square's.
+    """
+    last_index = square_size - 1
+    row_offsets = [min(i, last_index - i) for i in range(max(first_row, 0), min(first_row + rows, square_size))]
+    column_offsets = [min(j, last_index - j)
+                      for j in range(max(first_column, 0), min(first_column + columns, square_size))]
+    window_map = {offset: offset_character(starting_character, offset)
+                  for offset in set(row_offsets) | set(column_offsets)}
+    return [" ".join(window_map[min(row_offset, column_offset)] for column_offset in column_offsets)
+            for row_offset in row_offsets]
+
+
+def offset_character(starting_character, offset) -> str:
+    """
+        Return the character used for cells at the given distance from the border.
+    """
+    start_index = character_index(starting_character)  # Fallback to "A" like the square does
+    return ALLOWED_CHARACTERS[(start_index + offset) % len(ALLOWED_CHARACTERS)]
+
+
+@lru_cache(maxsize=ALPHABET_CACHE_SIZE)
+def compiled_alphabet(alphabet):
+    """
+        Return the lookup of an alphabet, a dict from each character to its first index. Compiled once per alphabet.
+    """
+    lookup = {}
+    for index, character in enumerate(alphabet):
+        lookup.setdefault(character, index)
+    return lookup
+
+
+def character_index(starting_character, alphabet=ALLOWED_CHARACTERS):
+    """
+        Return the index of starting_character in alphabet, or 0 when it is not in the alphabet.
+    """
+    return compiled_alphabet(alphabet).get(starting_character, 0)
+
+
+def dimension_offsets(size):
+    """
+        Return the distance of each index of a dimension from its nearer edge.
+        Dimensions up to OFFSETS_CACHE_MAX_SIZE share one cached tuple between all requests of that size.
+    """
+    if size > OFFSETS_CACHE_MAX_SIZE:
+        return tuple(min(i, size - 1 - i) for i in range(size))
+    return cached_dimension_offsets(size)
+
+
+@lru_cache(maxsize=OFFSETS_CACHE_SIZE)
+def cached_dimension_offsets(size):
+    return tuple(min(i, size - 1 - i) for i in range(size))
+
+
+def rectangle_offsets_and_map(rows, columns, starting_character="A", alphabet=ALLOWED_CHARACTERS):
+    """
+        Return the row offsets, the column offsets and the mapping from offset (ring) to character of a rectangle.
+    """
+    rings = (min(rows, columns) + 1) // 2
+    start_index = character_index(starting_character, alphabet)
+    shifted = alphabet[start_index:] + alphabet[:start_index]
+    ascii_map = list((shifted * (rings // len(shifted) + 1))[:rings])  # Ring r gets shifted[r % len(alphabet)]
+    return dimension_offsets(rows), dimension_offsets(columns), ascii_map
+
+
+def square_offsets_and_map(square_size, starting_character="A"):
+    """
+        Return the row/column offsets of a square and the mapping from offset to character.
+    """
+    offsets, _, ascii_map = rectangle_offsets_and_map(square_size, square_size, starting_character)
+    return offsets, ascii_map
+
+
+def mirrored_row(row_offset, square_size, ascii_map) -> str:
+    """
+        Build one row of the square (or of a rectangle square_size columns wide) from its left half only.
+        Every row is a palindrome: the left half holds the border characters up to the row offset
+        followed by the row's own character, and the right half is the left half mirrored.
+    """
+    half = (square_size + 1) // 2
+    row_offset = min(row_offset, half - 1)  # Rows deeper than the columns reach only show the column rings
+    left = ascii_map[:row_offset] + [ascii_map[row_offset]] * (half - row_offset)
+    return " ".join(left + left[:square_size // 2][::-1])
+
+
+def numpy_rectangle_construction(row_offsets, column_offsets, ascii_map) -> str:
+    """
+        Build the rectangle text with NumPy from the precomputed offsets and character mapping.
+    """
+    import numpy as np
+
+    buffer = np.empty((len(row_offsets), 2 * len(column_offsets)), dtype=np.uint8)
+    numpy_rectangle_fill(buffer, row_offsets, column_offsets, ascii_map)
+    return str(buffer.reshape(-1)[:-1].data, "ascii")  # Drop the trailing newline of the last row
 
-    # Ensure starting_character is one of the allowed ones; fallback to "A" if not
-    try:
-        start_index = allowed_chars.index(starting_character)
-    except ValueError:
-        start_index = 0
 
-    last_index = square_size - 1  # Last possible index (any direction) of a square
+def numpy_rectangle_fill(buffer, row_offsets, column_offsets, ascii_map):
+    """
+        Fill a (rows, 2 * columns) uint8 array with the rectangle laid out as "c c c ... c\\n" per row.
+        Each cell is the outer minimum of the row and column offsets gathered through the mapping.
+        Only the top-left quadrant is computed; the rest of the buffer is filled by mirroring it.
+    """
+    import numpy as np
 
-    offsets = [min(i, last_index - i) for i in range(square_size)]  # Precompute offsets for rows and columns
-    maximum_offset = max(offsets)  # Maximum offset possible (will be <= last_index // 2)
-    ascii_map = [allowed_chars[(start_index + offset) % total_letters] for offset in range(maximum_offset + 1)]  # Precompute the mapping from offset to character
+    rows, columns = len(row_offsets), len(column_offsets)
+    offset_type = np.min_scalar_type(max(rows, columns))
+    row_offsets = np.asarray(row_offsets, dtype=offset_type)
+    column_offsets = np.asarray(column_offsets, dtype=offset_type)
+    lookup = np.frombuffer("".join(ascii_map).encode("ascii"), dtype=np.uint8)
 
-    # Build the square rows using the precomputed mapping
-    rows = (" ".join(ascii_map[min(row_offset, column_offset)] for column_offset in offsets)
-            for row_offset in offsets)
+    row_half, column_half = (rows + 1) // 2, (columns + 1) // 2
+    mirrored_rows, mirrored_columns = rows // 2, columns // 2  # Copies of the top rows and left columns
 
-    return "\n".join(rows)  # Return a constructed square
+    buffer[:, 1::2] = ord(" ")
+    buffer[:, -1] = ord("\n")
+    cells = buffer[:, 0::2]  # View of the character cells
+    # Only the top-left quadrant is computed, in blocks of rows so the temporary offset matrix stays small
+    for first_row in range(0, row_half, NUMPY_BLOCK_ROWS):
+        block_offsets = row_offsets[first_row:min(first_row + NUMPY_BLOCK_ROWS, row_half)]
+        block_cells = cells[first_row:first_row + len(block_offsets)]
+        block_cells[:, :column_half] = lookup[np.minimum.outer(block_offsets, column_offsets[:column_half])]
+        block_cells[:, column_half:] = block_cells[:, :mirrored_columns][:, ::-1]
+    buffer[row_half:] = buffer[:mirrored_rows][::-1]  # Mirror the top rows onto the bottom rows
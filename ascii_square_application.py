@@ -1,28 +1,50 @@
 import tkinter as tk
+import tkinter.font as tkfont
 import sys
+import threading
+import time
 
-from random import choice
-from collections import deque
+from contextlib import nullcontext
 from functools import lru_cache
+from queue import Queue, Empty
 
-from ASCII_square import ascii_square_construction
+from ASCII_square import ascii_square_construction, cell
+from ascii_square_cells import PALETTE_OPTIONS, CellModel
+from ascii_square_metrics import registry
+from ascii_square_runs import CompactSquare
+from ascii_square_spiral import spiral_index, spiral_order
 from ascii_square_validation import validate_square_size, validate_size_length, validate_starting_character, \
     validate_char_length
 
 
 class AsciiSquareApp(tk.Tk):
+    # Canvas layout of the square: every cell is a fixed square, offset from the canvas origin
+    CELL_WIDTH = 30
+    CELL_HEIGHT = 30
+    START_X = 24
+    START_Y = 24
+
+    # Squares wider than this are rendered virtually: only the visible cells (plus a margin) exist as items
+    VIRTUAL_RENDER_THRESHOLD = 100
+    VIEWPORT_MARGIN = 5  # Extra rows/columns of items kept around the visible viewport
+
+    DRAW_FRAME_BUDGET = 0.012  # Seconds of drawing per event-loop slice before yielding to Tk
+
+    GENERATION_POLL_DELAY = 50  # Milliseconds between checks for a finished background build
+
+    LAG_PROBE_INTERVAL = 100  # Milliseconds between event-loop lag probes while tracing
+
     def __init__(self):
         super().__init__()
 
         self.copy_button = None
+        self.export_button = None
         self.pan_start_y = None
         self.pan_start_x = None
         self.ascii_text = None
-        self.snake_colors = None
         self.alternating_mode = None
         self.snake_mode = None
         self.default_mode = None
-        self.text_items = None
         self.vertical_scrollbar = None
         self.horizontal_scrollbar = None
         self.canvas = None
@@ -37,6 +59,11 @@ class AsciiSquareApp(tk.Tk):
 
         # Store the ASCII square here so we can copy it later
         self.current_ascii_square = ""
+        # Size and starting character of the square on the canvas, used to resolve cells by position
+        self.current_square_size = 0
+        self.current_starting_character = "A"
+        self.current_compact_square = None  # Ring descriptor of that square; drawing takes its runs from it
+        self.cell_model = None  # Palette indices and item IDs of a fully drawn square
 
         self.title("ASCII Square")
         self.geometry("1100x800")  # Set main window size with padding
@@ -46,8 +73,37 @@ class AsciiSquareApp(tk.Tk):
 
         # Initialize snake animation variables
         self.snake_animation_id = None
-        self.snake_items = []
-        self.spiral_order = []
+        self.snake_phase = 0  # Animation steps taken; each snake tag group is shifted by this many colors
+
+        self.draw_job_id = None  # Pending slice of incremental drawing
+
+        # Initialize background generation variables
+        self.generation_token = 0  # Incremented by every request; results carrying an older token are dropped
+        self.pending_generation = None  # (token, palette_list, uniform_color, alternating, snake, start time)
+        self.generation_requests = Queue()  # (token, square_size, starting_character) for the worker thread
+        self.generation_results = Queue()  # (token, square_size, starting_character, square, time, error)
+        self.generation_worker = None
+        self.generation_poll_id = None
+
+        # Initialize background export variables
+        self.export_results = Queue()  # Error of the finished export, None when it succeeded
+        self.export_poll_id = None  # Pending check for a finished export; None when no export is running
+
+        # Font used to draw whole rows (or color runs) as single text items; False if no font fits the grid
+        self.run_font = None
+
+        # Initialize virtualized rendering variables
+        self.virtual_square = None  # Parameters of the virtually rendered square, None when drawn in full
+        self.visible_cells = {}  # (row, column) -> canvas item currently showing that cell
+        self.visible_range = None
+        self.viewport_refresh_id = None
+
+        # Initialize opt-in tracing variables
+        self.tracer = None  # PipelineTracer while tracing is enabled
+        self.trace_enabled = None
+        self.trace_panel = None
+        self.trace_summary_label = None
+        self.lag_probe_id = None
 
         self.create_widgets()
         self.bind_mousewheel()
@@ -68,7 +124,7 @@ class AsciiSquareApp(tk.Tk):
         square_size_label.grid(row=0, column=0, sticky="w")
         square_size_label.bind("<Double-Button-1>", self.copy_text)
 
-        # Create a validation command so that only 4 characters can be entered
+        # Create a validation command so that only the digits of the maximum size can be entered
         vcmd = (self.register(validate_size_length), '%P')
         self.size_entry = tk.Entry(left_frame, width=5, validate="key", validatecommand=vcmd)
         self.size_entry.insert(0, "13")
@@ -91,16 +147,7 @@ class AsciiSquareApp(tk.Tk):
         palette_label.grid(row=0, column=0, sticky="w")
         palette_label.bind("<Double-Button-1>", self.copy_text)
         self.palette = tk.StringVar(value="None")
-        self.palette_options = \
-            (
-                ("None", "None"),
-                ("Red", "#FF0000"),
-                ("Green", "#00FF00"),
-                ("Blue", "#0000FF"),
-                ("Orange", "#FFA500"),
-                ("Purple", "#800080"),
-                ("Cyan", "#00FFFF")
-            )
+        self.palette_options = PALETTE_OPTIONS
         self.palette_menu = tk.OptionMenu(palette_frame, self.palette,
                                           *[name for name, code in self.palette_options])
         self.palette_menu.config(width=12)
@@ -135,6 +182,10 @@ class AsciiSquareApp(tk.Tk):
         self.generate_button.pack(side=tk.LEFT, padx=5)
         self.execution_time_label = tk.Label(generate_frame, text="", font=("Arial", 14))
         self.execution_time_label.pack(side=tk.LEFT, padx=10)
+        self.trace_enabled = tk.BooleanVar(value=False)
+        trace_button = tk.Checkbutton(generate_frame, text="Trace", variable=self.trace_enabled,
+                                      command=self.toggle_tracing, bg="#add8e6")
+        trace_button.pack(side=tk.LEFT, padx=5)
 
         # Bind the Enter key to trigger the generate_square method
         self.bind("<Return>", lambda event: self.generate_square())
@@ -146,10 +197,14 @@ class AsciiSquareApp(tk.Tk):
         # Copy button (centered above canvas)
         copy_button_frame = tk.Frame(self)
         copy_button_frame.pack(fill=tk.X)
-        self.copy_button = tk.Button(copy_button_frame, text="Copy ASCII square",
+        # Center the buttons horizontally:
+        copy_buttons = tk.Frame(copy_button_frame)
+        copy_buttons.pack(anchor="center")
+        self.copy_button = tk.Button(copy_buttons, text="Copy ASCII square",
                                      command=self.copy_ascii_square)
-        # Center the button horizontally:
-        self.copy_button.pack(pady=0, anchor="center")
+        self.copy_button.pack(side=tk.LEFT, pady=0, padx=5)
+        self.export_button = tk.Button(copy_buttons, text="Export...", command=self.export_ascii_square)
+        self.export_button.pack(side=tk.LEFT, pady=0, padx=5)
 
         # Canvas frame with vertical and horizontal scrollbars
         canvas_frame = tk.Frame(self, padx=10, pady=5)
@@ -160,14 +215,15 @@ class AsciiSquareApp(tk.Tk):
         self.horizontal_scrollbar = tk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, width=30)
         self.horizontal_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas = tk.Canvas(canvas_frame, bg="white",
-                                yscrollcommand=self.vertical_scrollbar.set,
-                                xscrollcommand=self.horizontal_scrollbar.set)
+                                yscrollcommand=self.on_canvas_yscroll,
+                                xscrollcommand=self.on_canvas_xscroll)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.vertical_scrollbar.config(command=self.canvas.yview)
         self.horizontal_scrollbar.config(command=self.canvas.xview)
 
         self.canvas.bind("<ButtonPress-2>", self.start_pan)
         self.canvas.bind("<B2-Motion>", self.do_pan)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_viewport_refresh())
 
     def copy_text(self, event):
         """
@@ -176,9 +232,10 @@ class AsciiSquareApp(tk.Tk):
         widget = event.widget
         try:
             if widget == self.canvas:
-                # For canvas text items, find the closest item and get its "text" attribute
-                item = self.canvas.find_closest(event.x, event.y)[0]
-                text = self.canvas.itemcget(item, "text")
+                # For canvas cells, compute the character under the pointer from its grid position
+                row = int((self.canvas.canvasy(event.y) - self.START_Y) // self.CELL_HEIGHT)
+                column = int((self.canvas.canvasx(event.x) - self.START_X) // self.CELL_WIDTH)
+                text = cell(self.current_square_size, self.current_starting_character, row, column)
             else:
                 text = widget.cget("text")
         except (IndexError, tk.TclError):
@@ -197,7 +254,58 @@ class AsciiSquareApp(tk.Tk):
             self.clipboard_append(self.current_ascii_square)
             self.show_copy_message()
 
-    def show_copy_message(self):
+    def export_ascii_square(self):
+        """
+            Export the current square to a PNG, SVG or HTML file chosen by the user, with the selected
+            palette and mode (snake squares are exported in their one-color form).
+        """
+        if not self.current_ascii_square or self.export_poll_id is not None:
+            return  # Nothing to export, or an export is still running
+        from tkinter import filedialog
+        from ascii_square_export import export_square
+
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".png",
+                                            filetypes=[("PNG image", "*.png"), ("SVG image", "*.svg"),
+                                                       ("HTML page", "*.html")])
+        if not path:
+            return
+        palette_colors = dict(self.palette_options)
+        color = palette_colors.get(self.palette.get())
+        # Large images take seconds to write, so the export runs off the Tk thread like square builds do
+        arguments = (self.current_square_size, self.current_starting_character, path)
+        options = {"mode": "alternating" if self.mode.get() == "alternating" else "one_color",
+                   "color": color if color != "None" else None}
+        threading.Thread(target=self.export_worker, args=(export_square, arguments, options), daemon=True).start()
+        self.export_button.config(text="Exporting...", state=tk.DISABLED)
+        self.export_poll_id = self.after(self.GENERATION_POLL_DELAY, self.poll_export)
+
+    def export_worker(self, export_square, arguments, options):
+        """
+            Write the export on a worker thread and hand the outcome to poll_export.
+        """
+        try:
+            export_square(*arguments, **options)
+            self.export_results.put(None)
+        except Exception as e:
+            self.export_results.put(e)
+
+    def poll_export(self):
+        """
+            Report the finished export on the Tk thread, or check again later.
+        """
+        try:
+            error = self.export_results.get_nowait()
+        except Empty:
+            self.export_poll_id = self.after(self.GENERATION_POLL_DELAY, self.poll_export)
+            return
+        self.export_poll_id = None
+        self.export_button.config(text="Export...", state=tk.NORMAL)
+        if error is not None:
+            self.error_label.config(text=str(error))
+            return
+        self.show_copy_message("ASCII square exported.")
+
+    def show_copy_message(self, text="ASCII square copied."):
         """
             Pop up a small "copied" message for 5 seconds.
         """
@@ -206,7 +314,7 @@ class AsciiSquareApp(tk.Tk):
         message.overrideredirect(True)
         message.config(bg="lightyellow")
 
-        label = tk.Label(message, text="ASCII square copied.", bg="lightyellow", font=("TkDefaultFont", 10))
+        label = tk.Label(message, text=text, bg="lightyellow", font=("TkDefaultFont", 10))
         label.pack(padx=10, pady=5)
 
         self.update_idletasks()  # Make sure geometry info is up to date
@@ -248,7 +356,10 @@ class AsciiSquareApp(tk.Tk):
         """
             Scroll the canvas vertically based on the mouse wheel movement.
         """
-        region = self.canvas.bbox("all")
+        if self.virtual_square is not None:
+            region = self.virtual_scroll_region(self.virtual_square[0])
+        else:
+            region = self.canvas.bbox("all")
         if region:
             region_height = region[3] - region[1]
             if region_height <= self.canvas.winfo_height():
@@ -277,6 +388,20 @@ class AsciiSquareApp(tk.Tk):
         self.pan_start_x = event.x
         self.pan_start_y = event.y
 
+    def on_canvas_yscroll(self, first, last):
+        """
+            Update the vertical scrollbar and refresh the virtualized viewport after the view moved.
+        """
+        self.vertical_scrollbar.set(first, last)
+        self.schedule_viewport_refresh()
+
+    def on_canvas_xscroll(self, first, last):
+        """
+            Update the horizontal scrollbar and refresh the virtualized viewport after the view moved.
+        """
+        self.horizontal_scrollbar.set(first, last)
+        self.schedule_viewport_refresh()
+
     def generate_square(self):
         """
             Generate the ASCII square based on user inputs and display it on the canvas.
@@ -286,18 +411,23 @@ class AsciiSquareApp(tk.Tk):
             self.after_cancel(self.snake_animation_id)
             self.snake_animation_id = None
 
-        self.canvas.delete("all")
-        self.snake_items = []
-        self.spiral_order = []
+        self.generation_token += 1  # Supersede any build still in flight
+        self.pending_generation = None
 
         size_value = self.size_entry.get()
         char_value = self.char_entry.get()
-        valid_size, error_size = validate_square_size(size_value)
-        valid_char, error_character = validate_starting_character(char_value)
+        if self.tracer is not None:
+            self.tracer.begin_generation(self.generation_token, size=size_value, starting_character=char_value,
+                                         mode=self.mode.get(), palette=self.palette.get())
+        with self.trace_span("validation"):
+            valid_size, error_size = validate_square_size(size_value)
+            valid_char, error_character = validate_starting_character(char_value)
 
         if not valid_size or not valid_char:
+            self.clear_square()
             error_message = error_size if not valid_size else error_character
             self.error_label.config(text=error_message)
+            self.end_trace("invalid")
             return
         else:
             self.error_label.config(text="")
@@ -329,17 +459,124 @@ class AsciiSquareApp(tk.Tk):
 
         uniform_color = palette_hex if use_default else None
 
-        # Synchronously compute the ASCII square
-        try:
-            ascii_square = ascii_square_construction(square_size, char_value)
-            execution_time = ascii_square_construction.last_execution_time
+        # Same letters as the square on the canvas: restyle its items instead of drawing it again
+        with self.trace_span("restyle"):
+            restyled = self.restyle_square(square_size, char_value, palette_list, uniform_color,
+                                           use_alternating, use_snake)
+        if restyled:
+            self.execution_time_label.config(text="Time: Restyled")
+            self.trace_when_idle("full_draw", outcome="restyled")
+            return
+
+        with self.trace_span("clear_canvas"):
+            self.clear_square()
+
+        # Compute the ASCII square on the worker thread; the result is picked up by poll_generation
+        token = self.generation_token
+        self.pending_generation = (token, palette_list, uniform_color, use_alternating, use_snake, time.perf_counter())
+        if self.generation_worker is None:
+            self.generation_worker = threading.Thread(target=self.generation_worker_loop, daemon=True)
+            self.generation_worker.start()
+        self.generation_requests.put((token, square_size, char_value))
+        self.execution_time_label.config(text="Generating...")
+        if self.generation_poll_id is None:
+            self.generation_poll_id = self.after(self.GENERATION_POLL_DELAY, self.poll_generation)
+
+    def clear_square(self):
+        """
+            Stop drawing and remove the current square from the canvas.
+        """
+        self.cancel_drawing()
+        self.canvas.delete("all")
+        self.stop_virtual_render()
+        self.cell_model = None
+        self.snake_phase = 0
+
+    def restyle_square(self, square_size, starting_character, palette_list, uniform_color, alternating, snake):
+        """
+            Recolor the square on the canvas in place when only the palette or mode changed; return whether it did.
+            One-color mode is one itemconfig on "copyable"; alternating mode is one itemconfig per "ring<d>" tag,
+            after splitting any one-color whole-row items into ring segments. Snake mode and unfinished drawings
+            are redrawn.
+        """
+        if snake or self.draw_job_id is not None or not self.canvas.find_withtag("copyable") \
+                or (square_size, starting_character) != (self.current_square_size, self.current_starting_character):
+            return False
+
+        if self.virtual_square is not None:
+            # Only the viewport exists; refresh_viewport colors newly visible cells from these parameters
+            self.virtual_square = (square_size, starting_character, palette_list, alternating, snake, uniform_color)
+            for (i, j), item in self.visible_cells.items():
+                self.canvas.itemconfig(item, fill=self.virtual_cell_fill(i, j), tags="copyable")
+            return True
+
+        cell_model = self.cell_model
+        if cell_model is None:
+            return False
+        cell_model.restyle(palette_list, alternating, snake, uniform_color)
+        if alternating and self.canvas.find_withtag("whole_row"):
+            self.split_whole_rows()  # The segments are drawn in the new colors
+        elif alternating:
+            for ring in range((square_size + 1) // 2):
+                self.canvas.itemconfig(f"ring{ring}", fill=palette_list[ring % len(palette_list)])
+        else:
+            self.canvas.itemconfig("copyable", fill=cell_model.palette[0])
+        return True
+
+    def generation_worker_loop(self):
+        """
+            Build requested squares off the Tk thread.
+            Requests that were superseded before the worker reached them are skipped without building.
+        """
+        while True:
+            token, square_size, starting_character = self.generation_requests.get()
+            if token != self.generation_token:
+                continue
+            try:
+                start_ns = time.perf_counter_ns()
+                ascii_square = ascii_square_construction(square_size, starting_character)
+                execution_time = registry.last_execution_time("ascii_square_construction")
+                tracer = self.tracer
+                if tracer is not None:
+                    tracer.add_span("construction", start_ns, time.perf_counter_ns(), thread="worker",
+                                    generation=token, cached=execution_time is None)
+                self.generation_results.put((token, square_size, starting_character, ascii_square, execution_time, None))
+            except Exception as e:
+                self.generation_results.put((token, square_size, starting_character, None, None, e))
+
+    def poll_generation(self):
+        """
+            Collect the result of the current request from the worker thread, dropping stale results,
+            and show the elapsed time while the build is still running.
+        """
+        self.generation_poll_id = None
+        while True:
+            try:
+                token, square_size, starting_character, ascii_square, execution_time, error = \
+                    self.generation_results.get_nowait()
+            except Empty:
+                break
+            if self.pending_generation is None or token != self.pending_generation[0]:
+                continue  # Result of a superseded request
+            _, palette_list, uniform_color, use_alternating, use_snake, _ = self.pending_generation
+            self.pending_generation = None
+            if error is not None:
+                self.execution_time_label.config(text="")
+                self.error_label.config(text=str(error))
+                self.end_trace("error")
+                return
             self.current_ascii_square = ascii_square  # Store the full ASCII square for later copying
-        except Exception as e:
-            self.error_label.config(text=str(e))
+            self.current_square_size = square_size
+            self.current_starting_character = starting_character
+            self.current_compact_square = CompactSquare(square_size, starting_character)
+            self.draw_and_update(ascii_square, palette_list,
+                                 uniform_color, execution_time, use_alternating, use_snake)
             return
 
-        self.draw_and_update(ascii_square, palette_list,
-                             uniform_color, execution_time, use_alternating, use_snake)
+        if self.pending_generation is not None:
+            elapsed = time.perf_counter() - self.pending_generation[5]
+            self.execution_time_label.config(text=f"Generating... {elapsed:.1f}s")
+            self.generation_poll_id = self.after(self.GENERATION_POLL_DELAY, self.poll_generation)
 
     def draw_and_update(self, ascii_square, palette_list, uniform_color, execution_time, use_alternating,
                         use_snake):
@@ -362,119 +599,430 @@ class AsciiSquareApp(tk.Tk):
     def draw_square_incremental(self, rows, cell_width, cell_height, start_x, start_y,
                                 palette_list, alternating, snake, uniform_color, row_index=0):
         """
-            Incrementally draw each row of the ASCII square on the canvas
+            Incrementally draw the rows of the ASCII square on the canvas.
+            Each event-loop slice draws as many rows as fit in DRAW_FRAME_BUDGET seconds, then
+            schedules the next slice under the single cancellable handle draw_job_id.
         """
-        if row_index >= len(rows):
-            # Finished drawing; update the scroll region if needed
+        self.draw_job_id = None
+        first_row = row_index
+        deadline = time.perf_counter() + self.DRAW_FRAME_BUDGET
+        with self.trace_span("create_text", first_row=first_row):
+            while row_index < len(rows):
+                self.draw_row(rows, row_index, cell_width, cell_height, start_x, start_y,
+                              palette_list, alternating, snake, uniform_color)
+                row_index += 1
+                if time.perf_counter() >= deadline:
+                    break
+        if first_row == 0:
+            self.trace_when_idle("first_visible_row")  # Tk redraws the canvas before idle callbacks queued later
+
+        if row_index < len(rows):
+            # Out of time for this slice; continue with the next row after the event loop has run.
+            self.draw_job_id = self.after(1, lambda: self.draw_square_incremental(rows, cell_width, cell_height,
+                                                                                  start_x, start_y, palette_list,
+                                                                                  alternating, snake, uniform_color,
+                                                                                  row_index))
+            return
+
+        # Finished drawing; update the scroll region if needed
+        with self.trace_span("scrollregion"):
             bbox = self.canvas.bbox("all")
             if bbox:
                 self.canvas.config(scrollregion=(bbox[0] - 4, bbox[1] - 4, bbox[2] + 4, bbox[3] + 4))
-            # Bind copy event to new items
-            self.canvas.tag_bind("copyable", "<Double-Button-1>", self.copy_text)
-            # If snake mode, set up animation
-            if snake:
-                self.spiral_order = list(self.get_spiral_order(len(rows)))
-                self.snake_items = [self.text_items[i][j] for (i, j) in self.spiral_order]
-                self.snake_colors = deque([self.canvas.itemcget(item, "fill") for item in self.snake_items])
+        # Bind copy event to new items
+        self.canvas.tag_bind("copyable", "<Double-Button-1>", self.copy_text)
+        # If snake mode, set up animation
+        if snake:
+            with self.trace_span("snake_setup"):
                 self.animate_snake(palette_list, len(rows))
-            return
+        self.trace_when_idle("full_draw", outcome="drawn")
 
-        # Process a single row
+    def draw_row(self, rows, row_index, cell_width, cell_height, start_x, start_y,
+                 palette_list, alternating, snake, uniform_color):
+        """
+            Draw a single row of the ASCII square, colored from the cell model.
+        """
         row = rows[row_index]
-        letters = row.split(" ")
-        item_row = []
+        cell_model = self.cell_model
+        run_font = None if snake else self.get_run_font()
+        if run_font is not None:
+            # One text item per row, or per ring segment in alternating mode, laid out on the same cell grid
+            self.draw_row_runs(row, row_index, cell_width, cell_height, start_x, start_y, run_font,
+                               whole_row=not alternating)
+            return
 
-        for j, letter in enumerate(letters):
+        cell_font = self.get_cell_font()
+        for j, letter in enumerate(row.split(" ")):
             x = start_x + j * cell_width
             y = start_y + row_index * cell_height
-            fill_color = "black"
-            if snake:
-                fill_color = choice(palette_list)
-            elif alternating:
-                layer = min(row_index, j, len(rows) - 1 - row_index, len(letters) - 1 - j)
-                fill_color = palette_list[layer % len(palette_list)]
-            elif uniform_color is not None:
-                fill_color = uniform_color
-
-            item = self.canvas.create_text(x, y, text=letter, anchor="nw",
-                                           font=("Courier", 16), fill=fill_color, tags="copyable")
-            item_row.append(item)
-
-        # Append this row to text_items (initialize if needed)
-        if not hasattr(self, "text_items") or self.text_items is None:
-            self.text_items = []
-        self.text_items.append(item_row)
-
-        # Schedule drawing of the next row after a short delay.
-        self.after(1, lambda: self.draw_square_incremental(rows, cell_width, cell_height,
-                                                           start_x, start_y, palette_list,
-                                                           alternating, snake, uniform_color,
-                                                           row_index + 1))
+            index = cell_model.color_index(row_index, j)
+            ring = min(row_index, j, len(rows) - 1 - row_index, len(rows) - 1 - j)
+            # In snake mode the palette index is also the cell's animation tag group
+            tags = ("copyable", f"ring{ring}", f"snake{index}") if snake else ("copyable", f"ring{ring}")
+            self.canvas.create_text(x, y, text=letter, anchor="nw", font=cell_font,
+                                    fill=cell_model.palette[index], tags=tags)
+
+    def cancel_drawing(self):
+        """
+            Cancel the pending slice of incremental drawing, if any.
+        """
+        if self.draw_job_id is not None:
+            self.after_cancel(self.draw_job_id)
+            self.draw_job_id = None
+
+    def draw_row_runs(self, row, row_index, cell_width, cell_height, start_x, start_y, run_font, whole_row=False):
+        """
+            Draw one row as a single "whole_row" item (one-color mode), or as one text item per ring segment:
+            a single cell for each outer ring the row crosses, and one run for the middle segment on its own ring.
+            Ring segments carry their "ring<d>" tag, so they can be recolored per ring in place.
+        """
+        y = start_y + row_index * cell_height
+        cell_model = self.cell_model
+        if whole_row:
+            self.canvas.create_text(start_x, y, text=row, anchor="nw", font=run_font,
+                                    fill=cell_model.palette[cell_model.color_index(row_index, 0)],
+                                    tags=("copyable", "whole_row"))
+            return
+        first = 0
+        for ring, length in self.current_compact_square.row_ring_runs(row_index):
+            fill = cell_model.palette[cell_model.color_index(row_index, first)]
+            # Cell j starts at character 2 * j of the row string ("A B C ...")
+            self.canvas.create_text(start_x + first * cell_width, y, text=row[2 * first:2 * (first + length) - 1],
+                                    anchor="nw", font=run_font, fill=fill, tags=("copyable", f"ring{ring}"))
+            first += length
+
+    def split_whole_rows(self):
+        """
+            Replace the whole-row items of a one-color square with ring segments colored from the cell model,
+            so that switching to alternating mode needs one delete and one row of segments per row, not a redraw.
+        """
+        self.canvas.delete("whole_row")
+        run_font = self.get_run_font()
+        compact_square = self.current_compact_square
+        for row_index in range(compact_square.square_size):
+            self.draw_row_runs(compact_square.row(row_index), row_index, self.CELL_WIDTH, self.CELL_HEIGHT,
+                               self.START_X, self.START_Y, run_font)
+
+    def get_run_font(self):
+        """
+            Return a monospace font whose character advance is half a cell, so that a row string
+            ("A B C ...") drawn as one text item lines up with the cell grid; None if no such font exists.
+        """
+        if self.run_font is None:
+            self.run_font = False
+            for pixel_size in range(self.CELL_WIDTH // 2, 2 * self.CELL_WIDTH):
+                font = tkfont.Font(family="Courier", size=-pixel_size)  # Negative sizes are in pixels
+                if font.metrics("fixed") and font.measure("A B") == 3 * self.CELL_WIDTH // 2 \
+                        and font.measure("A") * 2 == self.CELL_WIDTH:
+                    self.run_font = font
+                    break
+        return self.run_font or None
+
+    def get_cell_font(self):
+        """
+            Return the font of single-cell items: the run font when there is one, so a square looks
+            the same in every mode and whether it is drawn in full or virtually.
+        """
+        return self.get_run_font() or ("Courier", 16)
 
     def draw_square(self, ascii_square, alternating, snake, palette_list, uniform_color):
         """
             Clear the canvas and initiate the incremental drawing of the ASCII square.
         """
-        cell_width = 30
-        cell_height = 30
-        start_x = 24
-        start_y = 24
-
-        rows = ascii_square.split("\n")
+        cell_width = self.CELL_WIDTH
+        cell_height = self.CELL_HEIGHT
+        start_x = self.START_X
+        start_y = self.START_Y
+
+        self.cancel_drawing()
+        self.cell_model = None
+        with self.trace_span("clear_canvas"):
+            self.canvas.delete("all")  # Clear previous items
+        self.stop_virtual_render()
+
+        if self.current_square_size > self.VIRTUAL_RENDER_THRESHOLD:
+            self.draw_square_virtual(palette_list, alternating, snake, uniform_color)
+            return
 
-        self.text_items = []
-        self.canvas.delete("all")  # Clear previous items
+        with self.trace_span("split"):
+            rows = ascii_square.split("\n")
+        # Palette indices of every cell, assigned for the whole square at once
+        with self.trace_span("cell_model"):
+            self.cell_model = CellModel.for_mode(len(rows), palette_list, alternating, snake, uniform_color)
 
         # Start incremental drawing.
         self.draw_square_incremental(rows, cell_width, cell_height, start_x, start_y,
                                      palette_list, alternating, snake, uniform_color)
 
+    def draw_square_virtual(self, palette_list, alternating, snake, uniform_color):
+        """
+            Render the current square virtually: the scroll region covers the full square,
+            but canvas items exist only for the visible viewport and are recycled as the view moves.
+        """
+        square_size = self.current_square_size
+        self.virtual_square = (square_size, self.current_starting_character, palette_list,
+                               alternating, snake, uniform_color)
+        self.snake_phase = 0
+        with self.trace_span("scrollregion"):
+            self.canvas.config(scrollregion=self.virtual_scroll_region(square_size))
+        self.canvas.tag_bind("copyable", "<Double-Button-1>", self.copy_text)
+        self.refresh_viewport()
+        if snake:
+            with self.trace_span("snake_setup"):
+                self.animate_snake(palette_list, square_size)
+        # Only the viewport is drawn, so the first visible row and the full draw coincide
+        self.trace_when_idle("first_visible_row")
+        self.trace_when_idle("full_draw", outcome="drawn")
+
+    def virtual_scroll_region(self, square_size):
+        """
+            Return the scroll region (x1, y1, x2, y2) that a fully drawn square of the given size would occupy.
+        """
+        return (self.START_X - 4, self.START_Y - 4,
+                self.START_X + square_size * self.CELL_WIDTH + 4, self.START_Y + square_size * self.CELL_HEIGHT + 4)
+
+    def schedule_viewport_refresh(self):
+        """
+            Refresh the virtualized viewport once the event loop is idle, coalescing bursts of view changes.
+        """
+        if self.virtual_square is not None and self.viewport_refresh_id is None:
+            self.viewport_refresh_id = self.after_idle(self.refresh_viewport)
+
+    def refresh_viewport(self):
+        """
+            Make the canvas items match the visible viewport plus a margin.
+            Items of cells that left the viewport are moved and relabeled for the cells that entered it.
+        """
+        self.viewport_refresh_id = None
+        if self.virtual_square is None:
+            return
+        square_size, _, palette_list, _, snake, _ = self.virtual_square
+
+        margin = self.VIEWPORT_MARGIN
+        first_row = int((self.canvas.canvasy(0) - self.START_Y) // self.CELL_HEIGHT) - margin
+        last_row = int((self.canvas.canvasy(self.canvas.winfo_height()) - self.START_Y) // self.CELL_HEIGHT) + margin
+        first_column = int((self.canvas.canvasx(0) - self.START_X) // self.CELL_WIDTH) - margin
+        last_column = int((self.canvas.canvasx(self.canvas.winfo_width()) - self.START_X) // self.CELL_WIDTH) + margin
+        first_row, first_column = max(first_row, 0), max(first_column, 0)
+        last_row, last_column = min(last_row + 1, square_size), min(last_column + 1, square_size)
+
+        visible_range = (first_row, last_row, first_column, last_column)
+        if visible_range == self.visible_range:
+            return
+        self.visible_range = visible_range
+        with self.trace_span("viewport_refresh"):
+            self.update_viewport_items(square_size, palette_list, snake, visible_range)
+
+    def update_viewport_items(self, square_size, palette_list, snake, visible_range):
+        """
+            Move and relabel the items of cells that left the visible range for the cells that entered it.
+        """
+        first_row, last_row, first_column, last_column = visible_range
+        cell_font = self.get_cell_font()
+
+        # Collect the items whose cells are no longer in range so they can be reused
+        stale_items = []
+        for (i, j), item in list(self.visible_cells.items()):
+            if not (first_row <= i < last_row and first_column <= j < last_column):
+                stale_items.append(self.visible_cells.pop((i, j)))
+
+        window = self.current_compact_square.viewport_runs(first_row, first_column,
+                                                           last_row - first_row, last_column - first_column)
+        for i, row_runs in enumerate(window, first_row):
+            letters = "".join(character * length for character, length in row_runs)
+            for j, letter in enumerate(letters, first_column):
+                if (i, j) in self.visible_cells:
+                    continue
+                x = self.START_X + j * self.CELL_WIDTH
+                y = self.START_Y + i * self.CELL_HEIGHT
+                fill_color = self.virtual_cell_fill(i, j)
+                tags = "copyable"
+                if snake:
+                    tags = ("copyable", f"snake{self.get_snake_group(square_size, i, j, palette_list)}")
+                if stale_items:
+                    item = stale_items.pop()
+                    self.canvas.coords(item, x, y)
+                    self.canvas.itemconfig(item, text=letter, fill=fill_color, tags=tags)
+                else:
+                    item = self.canvas.create_text(x, y, text=letter, anchor="nw",
+                                                   font=cell_font, fill=fill_color, tags=tags)
+                self.visible_cells[i, j] = item
+
+        for item in stale_items:
+            self.canvas.delete(item)
+
+    def virtual_cell_fill(self, row, column):
+        """
+            Return the fill color of a virtually rendered cell, following the same rules as the full drawing.
+        """
+        square_size, _, palette_list, alternating, snake, uniform_color = self.virtual_square
+        if snake:
+            group = self.get_snake_group(square_size, row, column, palette_list)
+            return palette_list[(group - self.snake_phase) % len(palette_list)]
+        if alternating:
+            layer = min(row, column, square_size - 1 - row, square_size - 1 - column)
+            return palette_list[layer % len(palette_list)]
+        if uniform_color is not None:
+            return uniform_color
+        return "black"
+
+    def stop_virtual_render(self):
+        """
+            Forget the virtually rendered square and cancel its pending viewport refresh.
+        """
+        if self.viewport_refresh_id is not None:
+            self.after_cancel(self.viewport_refresh_id)
+            self.viewport_refresh_id = None
+        self.virtual_square = None
+        self.visible_cells = {}
+        self.visible_range = None
+
+    def get_snake_group(self, square_size, row, column, palette_list):
+        """
+            Return the snake tag group of a cell: its spiral index modulo the palette length.
+        """
+        return self.get_spiral_index(square_size, row, column) % len(palette_list)
+
     @staticmethod
-    @lru_cache(maxsize=128)
+    def get_spiral_index(n, row, column):
+        """
+            Return the position of (row, column) in the spiral order of a square of size n, in O(1).
+        """
+        return spiral_index(n, row, column)
+
+    @staticmethod
+    @lru_cache(maxsize=4)
     def get_spiral_order(n):
         """
-            Return a tuple of (row, col) positions in spiral order for a square of size n.
-        """
-        def spiral_generator():
-            top, left = 0, 0
-            bottom, right = n - 1, n - 1
-            while top <= bottom and left <= right:
-                for j in range(left, right + 1):
-                    yield top, j
-                top += 1
-                for i in range(top, bottom + 1):
-                    yield i, right
-                right -= 1
-                if top <= bottom:
-                    for j in range(right, left - 1, -1):
-                        yield bottom, j
-                    bottom -= 1
-                if left <= right:
-                    for i in range(bottom, top - 1, -1):
-                        yield i, left
-                    left += 1
-
-        # Convert generator output to a tuple for caching and reuse
-        return tuple(spiral_generator())
+            Return the spiral order of a square of size n as an array('I') of linear indices (row * n + column).
+            Use get_spiral_index or spiral_position for single lookups; they need no table at all.
+        """
+        return spiral_order(n)
 
     def animate_snake(self, palette_list, square_size):
         """
             Animate snake mode by rotating the colors of canvas text items.
+            Items are tagged "snake<k>" by spiral index modulo the palette length, so one step
+            shifts every group to its next color with one itemconfig call per palette color.
         """
-        if not self.snake_items:
-            return
-
-        # Rotate the stored deque of colors (O(1) rotation)
-        self.snake_colors.rotate(1)
-
-        # Update each canvas item's fill color using the rotated deque
-        for item, color in zip(self.snake_items, self.snake_colors):
-            self.canvas.itemconfig(item, fill=color)
+        start_ns = time.perf_counter_ns()
+        self.snake_phase += 1
+        for group in range(len(palette_list)):
+            self.canvas.itemconfig(f"snake{group}", fill=palette_list[(group - self.snake_phase) % len(palette_list)])
+        tracer = self.tracer
+        if tracer is not None:
+            # The frame ends once Tk has redrawn the recolored items
+            self.after_idle(lambda: tracer.record_frame(start_ns, time.perf_counter_ns()))
 
         # Set delay based on square size
         delay = 300 if square_size <= 50 else 1000
         self.snake_animation_id = self.after(delay, lambda: self.animate_snake(palette_list, square_size))
 
+    def toggle_tracing(self):
+        """
+            Start or stop recording per-stage traces, event-loop lag and animation frame times,
+            and show or hide the trace summary panel.
+        """
+        if self.trace_enabled.get():
+            from ascii_square_tracing import PipelineTracer
+
+            self.tracer = PipelineTracer()
+            self.show_trace_panel()
+            self.lag_probe_id = self.after(self.LAG_PROBE_INTERVAL, self.probe_event_loop,
+                                           time.perf_counter_ns() + self.LAG_PROBE_INTERVAL * 1_000_000, 0)
+        else:
+            if self.lag_probe_id is not None:
+                self.after_cancel(self.lag_probe_id)
+                self.lag_probe_id = None
+            if self.trace_panel is not None:
+                self.trace_panel.destroy()
+                self.trace_panel = None
+            self.tracer = None
+
+    def trace_span(self, name, **details):
+        """
+            Return a context manager timing a stage of the current generation; a no-op unless tracing.
+        """
+        return self.tracer.span(name, **details) if self.tracer is not None else nullcontext()
+
+    def trace_when_idle(self, mark, outcome=None):
+        """
+            Record a milestone of the current generation once the event loop is idle (i.e. after Tk has redrawn),
+            optionally ending the generation; nothing happens if another generation has started in between.
+        """
+        tracer = self.tracer
+        if tracer is None:
+            return
+        generation_id = tracer.current_generation()
+
+        def record():
+            if generation_id is not None and tracer.current_generation() == generation_id:
+                tracer.mark(mark)
+                if outcome is not None:
+                    self.end_trace(outcome)
+
+        self.after_idle(record)
+
+    def end_trace(self, outcome):
+        if self.tracer is not None:
+            self.tracer.end_generation(outcome)
+            self.update_trace_panel()
+
+    def probe_event_loop(self, expected_ns, probes):
+        """
+            Record how late this callback ran compared to when it was scheduled, then schedule the next probe.
+            The summary panel is refreshed about once a second.
+        """
+        self.lag_probe_id = None
+        if self.tracer is None:
+            return
+        now_ns = time.perf_counter_ns()
+        self.tracer.record_loop_lag(max(now_ns - expected_ns, 0))
+        if probes % (1000 // self.LAG_PROBE_INTERVAL) == 0:
+            self.update_trace_panel()
+        self.lag_probe_id = self.after(self.LAG_PROBE_INTERVAL, self.probe_event_loop,
+                                       now_ns + self.LAG_PROBE_INTERVAL * 1_000_000, probes + 1)
+
+    def show_trace_panel(self):
+        """
+            Open the trace summary window with its export button.
+        """
+        self.trace_panel = tk.Toplevel(self)
+        self.trace_panel.title("Trace summary")
+        self.trace_panel.protocol("WM_DELETE_WINDOW", self.close_trace_panel)
+        self.trace_summary_label = tk.Label(self.trace_panel, text="", font=("Courier", 11), justify=tk.LEFT,
+                                            anchor="nw")
+        self.trace_summary_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        tk.Button(self.trace_panel, text="Export trace...", command=self.export_trace).pack(pady=5)
+        self.update_trace_panel()
+
+    def close_trace_panel(self):
+        """
+            Closing the panel turns tracing off, like unchecking "Trace".
+        """
+        self.trace_enabled.set(False)
+        self.toggle_tracing()
+
+    def update_trace_panel(self):
+        if self.trace_panel is not None and self.tracer is not None:
+            self.trace_summary_label.config(text=self.tracer.summary_text())
+
+    def export_trace(self):
+        """
+            Save the recorded trace as Chrome trace event JSON (viewable in chrome://tracing or Perfetto).
+        """
+        if self.tracer is None:
+            return
+        from tkinter import filedialog
+
+        path = filedialog.asksaveasfilename(parent=self.trace_panel, defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            try:
+                self.tracer.export(path)
+            except OSError as error:
+                self.error_label.config(text=str(error))
+
     def on_closing(self):
         """
             Cancel any scheduled animations and cleanly close the application.
@@ -482,6 +1030,15 @@ class AsciiSquareApp(tk.Tk):
         # Cancel any scheduled callbacks before quitting.
         if self.snake_animation_id is not None:
             self.after_cancel(self.snake_animation_id)
+        self.cancel_drawing()
+        self.stop_virtual_render()
+        if self.generation_poll_id is not None:
+            self.after_cancel(self.generation_poll_id)
+        if self.lag_probe_id is not None:
+            self.after_cancel(self.lag_probe_id)
+        if self.export_poll_id is not None:
+            self.after_cancel(self.export_poll_id)
+        self.generation_token += 1  # Let the worker thread skip anything still queued
         self.quit()  # Stop the main loop.
         self.destroy()
         sys.exit(0)
@@ -0,0 +1,142 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+
+from ASCII_square import ALLOWED_CHARACTERS, build_square, build_square_into
+from ascii_square_cache import translation_tables
+
+
+PARALLEL_MIN_SIZE = 512  # Squares at least this wide are built in the process pool
+SERIAL_BATCH_CELLS = 4_000_000  # Batches with fewer unique cells in total are built serially
+
+
+def generate_batch(specs, workers=None, ordered=False):
+    """
+        Generate the squares of many (square_size, starting_character) specs, yielding
+        (square_size, starting_character, square) tuples as they finish.
+
+        Specs are deduplicated, and specs whose starting characters give the same square (unknown
+        characters count as "A") share one result, yielded once per spec with the caller's own character.
+        Specs are grouped by size: each size is built once, started with "A", and the other starting
+        characters are derived from it by translation. Large sizes are built in a pool of worker processes,
+        each filling a shared-memory buffer in place, with about one buffer per worker in flight at a time;
+        small batches are built serially.
+        With ordered=True results follow the order in which the specs first appear.
+    """
+    unique_specs = list(dict.fromkeys((square_size, starting_character) for square_size, starting_character in specs))
+    requested = {}  # (square_size, normalized character) -> the caller's starting characters
+    for square_size, starting_character in unique_specs:
+        requested.setdefault((square_size, normalize_character(starting_character)), []).append(starting_character)
+    characters_by_size = {}
+    for square_size, starting_character in requested:
+        characters_by_size.setdefault(square_size, []).append(starting_character)
+
+    total_cells = sum(square_size * square_size for square_size in characters_by_size)
+    if workers == 1 or total_cells < SERIAL_BATCH_CELLS:
+        results = serial_batch(characters_by_size)
+    else:
+        results = parallel_batch(characters_by_size, workers)
+    results = ((square_size, caller_character, square)
+               for square_size, starting_character, square in results
+               for caller_character in requested[square_size, starting_character])
+
+    if not ordered:
+        yield from results
+        return
+
+    finished = {}
+    position = 0
+    for square_size, starting_character, square in results:
+        finished[square_size, starting_character] = square
+        while position < len(unique_specs) and unique_specs[position] in finished:
+            spec = unique_specs[position]
+            yield spec + (finished.pop(spec),)
+            position += 1
+
+
+def serial_batch(characters_by_size):
+    """
+        Build every size in this process, deriving each starting character from one canonical square.
+    """
+    for square_size, characters in characters_by_size.items():
+        yield from derived_squares(square_size, build_square(square_size), characters)
+
+
+def parallel_batch(characters_by_size, workers):
+    """
+        Build large sizes in a process pool and small ones in this process while the pool works.
+        Each worker fills a shared-memory buffer allocated here, so the text is never pickled back.
+        Buffers are allocated only as workers become free, so about one per worker exists at a time.
+    """
+    workers = workers or os.cpu_count()
+    # Largest first, so the longest builds start as early as possible
+    pending = deque(sorted((square_size for square_size in characters_by_size if square_size >= PARALLEL_MIN_SIZE),
+                           reverse=True))
+    buffers = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+
+            def submit_next():
+                square_size = pending.popleft()
+                buffers[square_size] = SharedMemory(create=True, size=square_text_length(square_size) + 1)
+                futures[executor.submit(build_into_shared_memory, square_size, buffers[square_size].name)] = \
+                    square_size
+
+            while pending and len(futures) < workers:
+                submit_next()
+
+            small_sizes = {square_size: characters for square_size, characters in characters_by_size.items()
+                           if square_size < PARALLEL_MIN_SIZE}
+            yield from serial_batch(small_sizes)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    square_size = futures.pop(future)
+                    future.result()
+                    buffer = buffers.pop(square_size)
+                    with buffer.buf[:square_text_length(square_size)] as view:
+                        canonical = str(view, "ascii")  # The one copy, into the str handed to the caller
+                    release_buffer(buffer)
+                    if pending:
+                        submit_next()  # Before yielding, so the worker stays busy while the caller consumes
+                    yield from derived_squares(square_size, canonical, characters_by_size[square_size])
+    finally:
+        for buffer in buffers.values():
+            release_buffer(buffer)
+
+
+def build_into_shared_memory(square_size, name):
+    """
+        Worker entry point: write the canonical square of a size, plus a trailing newline,
+        straight into the named shared-memory buffer.
+    """
+    buffer = SharedMemory(name=name)
+    try:
+        build_square_into(buffer.buf, square_size)
+    finally:
+        buffer.close()
+
+
+def derived_squares(square_size, canonical, characters):
+    tables = translation_tables(ALLOWED_CHARACTERS)
+    for starting_character in characters:
+        square = canonical if starting_character == ALLOWED_CHARACTERS[0] \
+            else canonical.translate(tables[starting_character])
+        yield square_size, starting_character, square
+
+
+def normalize_character(starting_character):
+    return starting_character if len(starting_character) == 1 and starting_character in ALLOWED_CHARACTERS \
+        else ALLOWED_CHARACTERS[0]
+
+
+def square_text_length(square_size):
+    return 2 * square_size * square_size - 1  # n characters and n - 1 spaces per row, n - 1 newlines
+
+
+def release_buffer(buffer):
+    buffer.close()
+    buffer.unlink()
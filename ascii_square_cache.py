@@ -0,0 +1,114 @@
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from functools import lru_cache, update_wrapper
+
+
+SquareCacheInfo = namedtuple("SquareCacheInfo", ["hits", "misses", "derived", "evicted", "currsize", "maxbytes"])
+
+
+class TranslatedSquareCache:
+    """
+        Byte-bounded LRU cache for a square builder called as function(square_size, starting_character).
+        Only the canonical square of each size (started with the first alphabet character) is stored;
+        squares with other starting characters are derived from it through a precompiled str.translate
+        table that shifts every alphabet character, since a square's characters depend only on the
+        distance of each cell from the border.
+    """
+    def __init__(self, function, alphabet, max_bytes):
+        update_wrapper(self, function)
+        self.function = function
+        self.alphabet = alphabet
+        self.max_bytes = max_bytes
+        self.tables = translation_tables(alphabet)
+        self.squares = OrderedDict()  # square_size -> canonical square, least recently used first
+        self.current_bytes = 0
+        self.hits = self.misses = self.derived = self.evicted = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, square_size, starting_character="A"):
+        canonical_character = self.alphabet[0]
+        with self.lock:
+            canonical = self.squares.get(square_size)
+            if canonical is not None:
+                self.squares.move_to_end(square_size)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if canonical is None:
+            canonical = self.function(square_size, canonical_character)  # Built outside the lock
+            self.store(square_size, canonical)
+
+        table = self.tables.get(starting_character)
+        if table is None or starting_character == canonical_character:
+            return canonical  # Unknown characters fall back to the first one, like the builder does
+        with self.lock:
+            self.derived += 1
+        return canonical.translate(table)
+
+    def canonical(self, square_size):
+        """
+            Return the cached canonical square of a size, or None, without building it.
+        """
+        with self.lock:
+            canonical = self.squares.get(square_size)
+            if canonical is not None:
+                self.squares.move_to_end(square_size)
+                self.hits += 1
+            return canonical
+
+    def fits(self, length):
+        """
+            Whether a canonical square of length ASCII characters would fit the byte budget.
+        """
+        return sys.getsizeof("") + length <= self.max_bytes
+
+    def store(self, square_size, canonical):
+        """
+            Store a canonical square, evicting the least recently used ones until it fits the byte budget.
+            Squares larger than the whole budget are not stored.
+        """
+        size_in_bytes = sys.getsizeof(canonical)
+        if size_in_bytes > self.max_bytes:
+            return
+        with self.lock:
+            if square_size in self.squares:
+                return  # Another thread built it meanwhile
+            while self.squares and self.current_bytes + size_in_bytes > self.max_bytes:
+                _, evicted_square = self.squares.popitem(last=False)
+                self.current_bytes -= sys.getsizeof(evicted_square)
+                self.evicted += 1
+            self.squares[square_size] = canonical
+            self.current_bytes += size_in_bytes
+
+    def cache_info(self):
+        with self.lock:
+            return SquareCacheInfo(self.hits, self.misses, self.derived, self.evicted,
+                                   self.current_bytes, self.max_bytes)
+
+    def cache_clear(self):
+        with self.lock:
+            self.squares.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.derived = self.evicted = 0
+
+
+@lru_cache(maxsize=None)
+def translation_tables(alphabet):
+    """
+        Return one str.translate table per starting character, mapping the canonical square
+        (started with alphabet[0]) to the square started with that character. Compiled once per alphabet.
+    """
+    return {character: str.maketrans(alphabet, alphabet[shift:] + alphabet[:shift])
+            for shift, character in enumerate(alphabet)}
+
+
+def translated_square_cache(alphabet, max_bytes):
+    """
+        Decorator form of TranslatedSquareCache, used like functools.lru_cache.
+    """
+    def decorator(function):
+        return TranslatedSquareCache(function, alphabet, max_bytes)
+
+    return decorator
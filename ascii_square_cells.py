@@ -0,0 +1,94 @@
+
+
+MAX_PALETTE_LENGTH = 256  # Palette indices are stored as unsigned bytes
+
+# (name, hex code) of the selectable colors; "None" draws one-color squares in black
+PALETTE_OPTIONS = (
+    ("None", "None"),
+    ("Red", "#FF0000"),
+    ("Green", "#00FF00"),
+    ("Blue", "#0000FF"),
+    ("Orange", "#FFA500"),
+    ("Purple", "#800080"),
+    ("Cyan", "#00FFFF"),
+)
+PALETTE_COLORS = [code for _, code in PALETTE_OPTIONS if code != "None"]  # Cycled by alternating and snake modes
+
+
+class CellModel:
+    """
+        Compact color model of a fully drawn square: one uint8 palette index per cell in a bytearray.
+        Fill colors are looked up through the palette, so recoloring replaces the palette
+        (or the indices) instead of per-cell color strings.
+    """
+    def __init__(self, square_size, palette, colors):
+        if len(palette) > MAX_PALETTE_LENGTH:
+            raise ValueError(f"Palettes may have at most {MAX_PALETTE_LENGTH} colors.")
+        self.square_size = square_size
+        self.palette = palette
+        self.colors = colors  # bytearray of square_size * square_size palette indices, row-major
+
+    @classmethod
+    def for_mode(cls, square_size, palette_list, alternating, snake, uniform_color):
+        """
+            Return the cell model of a square drawn in the given mode, assigning all indices at once.
+        """
+        return cls(square_size, *mode_colors(square_size, palette_list, alternating, snake, uniform_color))
+
+    def restyle(self, palette_list, alternating, snake, uniform_color):
+        """
+            Switch the model to another palette or mode, keeping its items.
+        """
+        self.palette, self.colors = mode_colors(self.square_size, palette_list, alternating, snake, uniform_color)
+
+    def color_index(self, row, column):
+        return self.colors[row * self.square_size + column]
+
+
+def mode_colors(square_size, palette_list, alternating, snake, uniform_color):
+    """
+        Return the (palette, palette indices) of a square drawn in the given mode.
+    """
+    if snake:
+        return list(palette_list), snake_color_indices(square_size, len(palette_list))
+    if alternating:
+        return list(palette_list), ring_color_indices(square_size, len(palette_list))
+    return [uniform_color if uniform_color is not None else "black"], bytearray(square_size * square_size)
+
+
+def ring_color_indices(square_size, palette_length):
+    """
+        Return the palette index (ring modulo the palette length) of every cell as a bytearray.
+    """
+    # Row with ring r: the first r cells count up the rings, then ring r fills the middle, mirrored
+    prefix = bytes(ring % palette_length for ring in range((square_size + 1) // 2))
+    colors = bytearray()
+    for row in range(square_size):
+        ring = min(row, square_size - 1 - row)
+        left = prefix[:ring]
+        colors += left + bytes((prefix[ring],)) * (square_size - 2 * ring) + left[::-1]
+    return colors
+
+
+def snake_color_indices(square_size, palette_length):
+    """
+        Return the palette index (spiral index modulo the palette length) of every cell as a bytearray.
+        Each side of each ring is a strided slice of the cells and a contiguous stretch of the spiral,
+        so it is assigned with one slice assignment instead of cell by cell.
+    """
+    cycle = bytes(range(palette_length)) * (square_size * square_size // palette_length + 2)
+    colors = bytearray(square_size * square_size)
+    index = 0  # Spiral index of the first cell of the next side
+    for ring in range((square_size + 1) // 2):
+        last = square_size - 1 - ring
+        if ring == last:
+            colors[ring * square_size + ring] = cycle[index % palette_length]  # Center cell of an odd square
+            break
+        side = last - ring
+        # Top, right, bottom and left sides, each starting at a corner and stopping before the next one
+        for start, step in ((ring * square_size + ring, 1), (ring * square_size + last, square_size),
+                            (last * square_size + last, -1), (last * square_size + ring, -square_size)):
+            offset = index % palette_length
+            colors[start:start + side * step:step] = cycle[offset:offset + side]
+            index += side
+    return colors
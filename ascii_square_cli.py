@@ -0,0 +1,137 @@
+"""
+    Headless command-line entry point: python -m ascii_square_cli SIZE [options]
+
+    Never imports tkinter, and imports the construction modules only after the arguments are parsed,
+    so startup stays close to bare interpreter startup. Stdout holds only the square.
+"""
+import sys
+
+
+USAGE = """usage: python -m ascii_square_cli SIZE [options]
+
+Print an ASCII square without starting the GUI.
+
+options:
+  -s, --start CHAR     starting character (default: A)
+  -o, --output FILE    write the square to FILE instead of stdout
+  --stream             stream rows in chunks instead of building the whole square first
+  --chunk-rows N       rows per write in streaming mode (default: 256)
+  --repeat N           number of times to generate the square (default: 1)
+  --bench              report per-run timings and metrics on stderr instead of printing the square
+  -h, --help           show this message and exit
+"""
+
+
+class Arguments:
+    size = None
+    start = "A"
+    output = None
+    stream = False
+    chunk_rows = 256
+    repeat = 1
+    bench = False
+
+
+def parse_arguments(argv):
+    """
+        Parse the command line by hand: argparse alone costs several milliseconds of imports.
+        Raises ValueError with a message for invalid command lines.
+    """
+    arguments = Arguments()
+    options_with_values = {"-s": "start", "--start": "start", "-o": "output", "--output": "output",
+                           "--chunk-rows": "chunk_rows", "--repeat": "repeat"}
+    flags = {"--stream": "stream", "--bench": "bench"}
+    remaining = list(argv)
+    while remaining:
+        argument = remaining.pop(0)
+        name, separator, value = argument.partition("=")
+        if argument in ("-h", "--help"):
+            sys.stdout.write(USAGE)
+            sys.exit(0)
+        elif name in options_with_values:
+            if not separator:
+                if not remaining:
+                    raise ValueError(f"option {name} expects a value")
+                value = remaining.pop(0)
+            attribute = options_with_values[name]
+            if attribute in ("chunk_rows", "repeat"):
+                if not value.isdecimal() or int(value) == 0:
+                    raise ValueError(f"option {name} expects a positive integer")
+                value = int(value)
+            setattr(arguments, attribute, value)
+        elif argument in flags:
+            setattr(arguments, flags[argument], True)
+        elif argument.startswith("-") and len(argument) > 1 and not argument[1:].isdigit():
+            raise ValueError(f"unrecognized option {argument}")
+        elif arguments.size is None:
+            arguments.size = argument
+        else:
+            raise ValueError(f"unexpected argument {argument}")
+    if arguments.size is None:
+        raise ValueError("the square size is required")
+    return arguments
+
+
+def main(argv=None):
+    try:
+        arguments = parse_arguments(sys.argv[1:] if argv is None else argv)
+    except ValueError as error:
+        sys.stderr.write(USAGE.split("\n\n")[0] + f"\nerror: {error}\n")
+        return 2
+
+    from ascii_square_validation import validate_square_size, validate_starting_character
+
+    valid_size, error_size = validate_square_size(arguments.size)
+    valid_char, error_character = validate_starting_character(arguments.start)
+    if not valid_size or not valid_char:
+        print(error_size if not valid_size else error_character, file=sys.stderr)
+        return 2
+    square_size = int(arguments.size)
+
+    import time
+    from ASCII_square import ascii_square_construction, write_square
+    from ascii_square_metrics import registry
+
+    registry.echo = False  # The per-call timing line would mix with the square on stdout
+
+    output = None
+    if arguments.output is not None:
+        output = open(arguments.output, "wb")
+    elif not arguments.bench:
+        output = sys.stdout.buffer
+
+    try:
+        for run in range(1, max(arguments.repeat, 1) + 1):
+            # Only the first run writes the square; the others just repeat the work for timing
+            destination = output if run == 1 else None
+            start_time = time.perf_counter_ns()
+            if arguments.stream:
+                if destination is None:
+                    import os
+                    with open(os.devnull, "wb") as sink:
+                        write_square(square_size, arguments.start, sink, arguments.chunk_rows)
+                else:
+                    write_square(square_size, arguments.start, destination, arguments.chunk_rows)
+            else:
+                square = ascii_square_construction(square_size, arguments.start)
+                if destination is not None:
+                    destination.write(square.encode("ascii"))
+            if destination is not None:
+                destination.write(b"\n")
+            elapsed_ms = (time.perf_counter_ns() - start_time) / 1e6
+            if arguments.bench:
+                cached = not arguments.stream and registry.last_execution_time("ascii_square_construction") is None
+                print(f"run {run}: {elapsed_ms:.3f} ms{' (cached)' if cached else ''}", file=sys.stderr)
+    finally:
+        if output is not None:
+            output.flush()
+            if arguments.output is not None:
+                output.close()
+
+    if arguments.bench:
+        print(registry.export_json(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""
+    Export squares to PNG, SVG and HTML without a Tk canvas.
+
+        python -m ascii_square_export SIZE OUTPUT [--start CHAR] [--mode one_color|alternating]
+                                      [--color NAME] [--scale N]
+
+    Every format is written row by row, so memory stays O(n) for any square size. PNG images tile
+    a pre-rasterized 5x7 glyph atlas (with NumPy when it is installed) into palette-indexed scanlines
+    that are compressed as they are produced; no imaging library is needed.
+"""
+import struct
+import zlib
+
+from ASCII_square import ALLOWED_CHARACTERS, FAST_ENGINE_AVAILABLE
+from ascii_square_cells import PALETTE_COLORS, PALETTE_OPTIONS
+
+
+EXPORT_FORMATS = ("png", "svg", "html")
+EXPORT_MODES = ("one_color", "alternating")
+
+BACKGROUND_COLOR = "#FFFFFF"
+DEFAULT_COLOR = "#000000"  # One-color squares without a chosen color, like the GUI's "None"
+
+PNG_CELL_PIXELS = 8  # Cell side at scale 1: a 5x7 glyph, one blank column on each side and a blank bottom line
+PNG_COMPRESS_LEVEL = 1  # The scanlines are highly repetitive, so fast compression already shrinks them well
+PNG_IDAT_BYTES = 1 << 20  # Compressed bytes per IDAT chunk
+
+SVG_CELL_PIXELS = 30  # Same grid as the GUI canvas
+SVG_FONT_SIZE = 16
+
+# 5x7 bitmaps of A-Z and a-z: seven rows per glyph, bit 4 is the leftmost pixel
+GLYPHS = {
+    "A": (0x0E, 0x11, 0x11, 0x11, 0x1F, 0x11, 0x11), "B": (0x1E, 0x11, 0x11, 0x1E, 0x11, 0x11, 0x1E),
+    "C": (0x0E, 0x11, 0x10, 0x10, 0x10, 0x11, 0x0E), "D": (0x1C, 0x12, 0x11, 0x11, 0x11, 0x12, 0x1C),
+    "E": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x1F), "F": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x10),
+    "G": (0x0E, 0x11, 0x10, 0x17, 0x11, 0x11, 0x0F), "H": (0x11, 0x11, 0x11, 0x1F, 0x11, 0x11, 0x11),
+    "I": (0x0E, 0x04, 0x04, 0x04, 0x04, 0x04, 0x0E), "J": (0x07, 0x02, 0x02, 0x02, 0x02, 0x12, 0x0C),
+    "K": (0x11, 0x12, 0x14, 0x18, 0x14, 0x12, 0x11), "L": (0x10, 0x10, 0x10, 0x10, 0x10, 0x10, 0x1F),
+    "M": (0x11, 0x1B, 0x15, 0x15, 0x11, 0x11, 0x11), "N": (0x11, 0x11, 0x19, 0x15, 0x13, 0x11, 0x11),
+    "O": (0x0E, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E), "P": (0x1E, 0x11, 0x11, 0x1E, 0x10, 0x10, 0x10),
+    "Q": (0x0E, 0x11, 0x11, 0x11, 0x15, 0x12, 0x0D), "R": (0x1E, 0x11, 0x11, 0x1E, 0x14, 0x12, 0x11),
+    "S": (0x0F, 0x10, 0x10, 0x0E, 0x01, 0x01, 0x1E), "T": (0x1F, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04),
+    "U": (0x11, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E), "V": (0x11, 0x11, 0x11, 0x11, 0x11, 0x0A, 0x04),
+    "W": (0x11, 0x11, 0x11, 0x15, 0x15, 0x15, 0x0A), "X": (0x11, 0x11, 0x0A, 0x04, 0x0A, 0x11, 0x11),
+    "Y": (0x11, 0x11, 0x11, 0x0A, 0x04, 0x04, 0x04), "Z": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x10, 0x1F),
+    "a": (0x00, 0x00, 0x0E, 0x01, 0x0F, 0x11, 0x0F), "b": (0x10, 0x10, 0x16, 0x19, 0x11, 0x11, 0x1E),
+    "c": (0x00, 0x00, 0x0E, 0x10, 0x10, 0x11, 0x0E), "d": (0x01, 0x01, 0x0D, 0x13, 0x11, 0x11, 0x0F),
+    "e": (0x00, 0x00, 0x0E, 0x11, 0x1F, 0x10, 0x0E), "f": (0x06, 0x09, 0x08, 0x1C, 0x08, 0x08, 0x08),
+    "g": (0x00, 0x0F, 0x11, 0x11, 0x0F, 0x01, 0x0E), "h": (0x10, 0x10, 0x16, 0x19, 0x11, 0x11, 0x11),
+    "i": (0x04, 0x00, 0x0C, 0x04, 0x04, 0x04, 0x0E), "j": (0x02, 0x00, 0x06, 0x02, 0x02, 0x12, 0x0C),
+    "k": (0x10, 0x10, 0x12, 0x14, 0x18, 0x14, 0x12), "l": (0x0C, 0x04, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "m": (0x00, 0x00, 0x1A, 0x15, 0x15, 0x11, 0x11), "n": (0x00, 0x00, 0x16, 0x19, 0x11, 0x11, 0x11),
+    "o": (0x00, 0x00, 0x0E, 0x11, 0x11, 0x11, 0x0E), "p": (0x00, 0x00, 0x1E, 0x11, 0x1E, 0x10, 0x10),
+    "q": (0x00, 0x00, 0x0D, 0x13, 0x0F, 0x01, 0x01), "r": (0x00, 0x00, 0x16, 0x19, 0x10, 0x10, 0x10),
+    "s": (0x00, 0x00, 0x0E, 0x10, 0x0E, 0x01, 0x1E), "t": (0x08, 0x08, 0x1C, 0x08, 0x08, 0x09, 0x06),
+    "u": (0x00, 0x00, 0x11, 0x11, 0x11, 0x13, 0x0D), "v": (0x00, 0x00, 0x11, 0x11, 0x11, 0x0A, 0x04),
+    "w": (0x00, 0x00, 0x11, 0x11, 0x15, 0x15, 0x0A), "x": (0x00, 0x00, 0x11, 0x0A, 0x04, 0x0A, 0x11),
+    "y": (0x00, 0x00, 0x11, 0x11, 0x0F, 0x01, 0x0E), "z": (0x00, 0x00, 0x1F, 0x02, 0x04, 0x08, 0x1F),
+}
+
+
+def export_square(square_size, starting_character, destination, export_format=None, mode="one_color",
+                  color=None, palette=None, scale=1):
+    """
+        Export a square to a path or a binary file object.
+        The format is taken from the path's suffix unless export_format is given (it is required for file objects).
+        One-color squares use color (black by default); alternating squares cycle palette
+        (the GUI's palette by default) by ring.
+    """
+    if export_format is None:
+        if not isinstance(destination, str):
+            raise ValueError("An export format is required when exporting to a file object.")
+        export_format = destination.rpartition(".")[2].lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {export_format!r}; expected one of {', '.join(EXPORT_FORMATS)}.")
+    colors = export_colors(mode, color, palette)
+    writer = {"png": lambda fileobj: write_png(square_size, starting_character, fileobj, colors, scale),
+              "svg": lambda fileobj: write_svg(square_size, starting_character, fileobj, colors),
+              "html": lambda fileobj: write_html(square_size, starting_character, fileobj, colors)}[export_format]
+
+    if isinstance(destination, str):
+        with open(destination, "wb") as fileobj:
+            writer(fileobj)
+    else:
+        writer(destination)
+
+
+def export_colors(mode, color=None, palette=None):
+    """
+        Return the colors cycled by ring: one color in one-color mode, the palette in alternating mode.
+    """
+    if mode not in EXPORT_MODES:
+        raise ValueError(f"Unknown export mode {mode!r}; expected one of {', '.join(EXPORT_MODES)}.")
+    if mode == "one_color":
+        return [color if color is not None else DEFAULT_COLOR]
+    return list(palette) if palette else list(PALETTE_COLORS)
+
+
+def row_rings(square_size):
+    """
+        Return a function mapping the ring of a row to the ring of each of its columns.
+    """
+    offsets = [min(j, square_size - 1 - j) for j in range(square_size)]
+    return lambda ring: [min(ring, offset) for offset in offsets]
+
+
+def write_png(square_size, starting_character, fileobj, colors, scale=1):
+    """
+        Write the square as a palette-indexed PNG: index 0 is the background, index k + 1 is colors[k].
+        Each row of cells becomes cell-height scanlines tiled from the glyph atlas and compressed right away.
+    """
+    if len(colors) > 255:
+        raise ValueError("PNG exports support at most 255 colors.")
+    start_index = max(ALLOWED_CHARACTERS.find(starting_character), 0)
+    cell_pixels = PNG_CELL_PIXELS * scale
+    bit_depth = 4 if len(colors) < 16 else 8  # Cells are an even number of pixels wide, so 4-bit rows stay byte-aligned
+    side = square_size * cell_pixels
+
+    fileobj.write(b"\x89PNG\r\n\x1a\n")
+    write_png_chunk(fileobj, b"IHDR", struct.pack(">IIBBBBB", side, side, bit_depth, 3, 0, 0, 0))
+    write_png_chunk(fileobj, b"PLTE", b"".join(bytes.fromhex(code.lstrip("#"))
+                                               for code in [BACKGROUND_COLOR] + list(colors)))
+
+    compressor = zlib.compressobj(PNG_COMPRESS_LEVEL)
+    pending = []
+    pending_bytes = 0
+    for scanlines in png_row_scanlines(square_size, start_index, len(colors), scale, bit_depth):
+        compressed = compressor.compress(scanlines)
+        if compressed:
+            pending.append(compressed)
+            pending_bytes += len(compressed)
+        if pending_bytes >= PNG_IDAT_BYTES:
+            write_png_chunk(fileobj, b"IDAT", b"".join(pending))
+            pending, pending_bytes = [], 0
+    pending.append(compressor.flush())
+    write_png_chunk(fileobj, b"IDAT", b"".join(pending))
+    write_png_chunk(fileobj, b"IEND", b"")
+
+
+def write_png_chunk(fileobj, chunk_type, data):
+    fileobj.write(struct.pack(">I", len(data)) + chunk_type + data +
+                  struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+
+def glyph_atlas(scale):
+    """
+        Return the rasterized glyphs of ALLOWED_CHARACTERS, in order, as cell-sized lists of 0/1 pixel rows.
+    """
+    cell_pixels = PNG_CELL_PIXELS * scale
+    atlas = []
+    for character in ALLOWED_CHARACTERS:
+        cell_rows = []
+        for bits in GLYPHS[character] + (0,):  # The eighth line is the blank gap between rows
+            pixels = [0] + [(bits >> (4 - x)) & 1 for x in range(5)] + [0, 0]
+            line = [pixel for pixel in pixels for _ in range(scale)]
+            cell_rows.extend([line] * scale)
+        assert len(cell_rows) == cell_pixels and len(cell_rows[0]) == cell_pixels
+        atlas.append(cell_rows)
+    return atlas
+
+
+def png_row_scanlines(square_size, start_index, color_count, scale, bit_depth):
+    """
+        Yield the filtered scanlines of each row of cells as one bytes-like object.
+    """
+    if FAST_ENGINE_AVAILABLE:
+        yield from numpy_png_row_scanlines(square_size, start_index, color_count, scale, bit_depth)
+        return
+
+    cell_pixels = PNG_CELL_PIXELS * scale
+    atlas = glyph_atlas(scale)
+    letters = len(ALLOWED_CHARACTERS)
+    # tiles[line][glyph * color_count + color]: the packed bytes of one cell's scanline
+    tiles = []
+    for line in range(cell_pixels):
+        line_tiles = []
+        for glyph in atlas:
+            for color in range(color_count):
+                indices = [pixel * (color + 1) for pixel in glyph[line]]
+                if bit_depth == 4:
+                    indices = [(high << 4) | low for high, low in zip(indices[::2], indices[1::2])]
+                line_tiles.append(bytes(indices))
+        tiles.append(line_tiles)
+
+    rings_of_row = row_rings(square_size)
+    for row in range(square_size):
+        rings = rings_of_row(min(row, square_size - 1 - row))
+        keys = [((start_index + ring) % letters) * color_count + ring % color_count for ring in rings]
+        yield b"".join(b"\x00" + b"".join(map(line_tiles.__getitem__, keys)) for line_tiles in tiles)
+
+
+def numpy_png_row_scanlines(square_size, start_index, color_count, scale, bit_depth):
+    """
+        Vectorized png_row_scanlines: each row is one gather from a (glyph, color) tile atlas.
+    """
+    import numpy as np
+
+    cell_pixels = PNG_CELL_PIXELS * scale
+    letters = len(ALLOWED_CHARACTERS)
+    masks = np.array(glyph_atlas(scale), dtype=np.uint8)  # (letters, cell, cell)
+    # tiles[line, glyph * color_count + color] holds one scanline of that glyph drawn in that color
+    tiles = (masks[:, None] * np.arange(1, color_count + 1, dtype=np.uint8)[None, :, None, None])
+    tiles = tiles.reshape(letters * color_count, cell_pixels, cell_pixels)
+    if bit_depth == 4:
+        tiles = (tiles[:, :, 0::2] << 4) | tiles[:, :, 1::2]
+    tiles = np.ascontiguousarray(tiles.transpose(1, 0, 2))
+    row_bytes = square_size * tiles.shape[2]
+
+    offsets = np.arange(square_size)
+    offsets = np.minimum(offsets, offsets[::-1])
+    cells = np.empty((cell_pixels, square_size, tiles.shape[2]), dtype=np.uint8)
+    scanlines = np.zeros((cell_pixels, row_bytes + 1), dtype=np.uint8)  # Column 0 is the filter type (none)
+    for row in range(square_size):
+        rings = np.minimum(offsets, min(row, square_size - 1 - row))
+        keys = ((start_index + rings) % letters) * color_count + rings % color_count
+        np.take(tiles, keys, axis=1, out=cells)  # (lines, cells, bytes), gathered in scanline order
+        scanlines[:, 1:] = cells.reshape(cell_pixels, row_bytes)
+        yield scanlines  # Consumed by the compressor before the next row overwrites it
+
+
+def write_svg(square_size, starting_character, fileobj, colors, chunk_rows=64):
+    """
+        Stream the square as SVG: one text element per color and row, with one x position per letter,
+        so every letter sits on the cell grid whatever the font.
+        Rows are assembled from precomputed per-color strings of the outer rings, so each row costs
+        O(colors) slices rather than one element per cell.
+    """
+    cell = SVG_CELL_PIXELS
+    side = square_size * cell
+    color_count = len(colors)
+    half = (square_size + 1) // 2
+    x_positions = [str(cell * column + cell // 2) for column in range(square_size)]
+    all_x = SlicedJoin(x_positions)
+    letter = ring_letters(starting_character, half)
+
+    # Per color: the rings r < half of that color, as x positions of the left (column r) and
+    # right (column n - 1 - r, listed right to left) single cells, and as letters
+    left_x, right_x, color_letters = [], [], []
+    for color in range(color_count):
+        rings = range(color, half, color_count)
+        left_x.append(SlicedJoin([x_positions[ring] for ring in rings]))
+        right_x.append(SlicedJoin([x_positions[square_size - 1 - ring] for ring in reversed(rings)]))
+        color_letters.append("".join(letter[ring] for ring in rings))
+
+    write = fileobj.write
+    write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{side}" height="{side}" viewBox="0 0 {side} {side}">\n'
+          f'<rect width="100%" height="100%" fill="{BACKGROUND_COLOR}"/>\n'
+          f'<g font-family="Courier, monospace" font-size="{SVG_FONT_SIZE}" text-anchor="middle">\n'
+          .encode("ascii"))
+    chunk = []
+    for row in range(square_size):
+        ring = min(row, square_size - 1 - row)
+        y = cell * row + (cell + SVG_FONT_SIZE) // 2
+        for color in range(color_count):
+            count = len(range(color, ring, color_count))  # Outer rings of this color on each side
+            x_parts = [left_x[color].head(count)]
+            letters = color_letters[color][:count]
+            if ring % color_count == color:
+                # The middle run: ring r from column r to column n - 1 - r
+                x_parts.append(all_x.slice(ring, square_size - ring))
+                letters += letter[ring] * (square_size - 2 * ring)
+            x_parts.append(right_x[color].tail(count))
+            letters += color_letters[color][:count][::-1]
+            if letters:
+                x_attribute = " ".join(part for part in x_parts if part)
+                chunk.append(f'<text x="{x_attribute}" y="{y}" fill="{colors[color]}">{letters}</text>\n')
+        if row % chunk_rows == chunk_rows - 1:
+            write("".join(chunk).encode("ascii"))
+            chunk = []
+    chunk.append("</g>\n</svg>\n")
+    write("".join(chunk).encode("ascii"))
+
+
+def write_html(square_size, starting_character, fileobj, colors, chunk_rows=64):
+    """
+        Stream the square as an HTML page: a pre block in which every ring run is a span of one CSS class.
+        The spans of the outer rings are joined once; each row slices them and adds its middle run.
+    """
+    write = fileobj.write
+    color_count = len(colors)
+    styles = "".join(f".c{index}{{color:{color}}}" for index, color in enumerate(colors))
+    write(f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="ascii">\n<title>ASCII square {square_size}</title>\n'
+          f'<style>pre{{font-family:Courier,monospace;line-height:1.2}}{styles}</style>\n</head>\n<body>\n'
+          f'<pre class="c0">\n'.encode("ascii"))
+
+    half = (square_size + 1) // 2
+    letter = ring_letters(starting_character, half)
+    if color_count == 1:
+        spans = letter  # The pre block already has the only color
+    else:
+        spans = [f'<span class="c{ring % color_count}">{letter[ring]}</span>' for ring in range(half)]
+    left = SlicedJoin(spans)
+    right = SlicedJoin(spans[::-1])
+
+    chunk = []
+    for row in range(square_size):
+        ring = min(row, square_size - 1 - row)
+        middle = " ".join(letter[ring] * (square_size - 2 * ring))
+        if color_count > 1:
+            middle = f'<span class="c{ring % color_count}">{middle}</span>'
+        chunk.append(" ".join(part for part in (left.head(ring), middle, right.tail(ring)) if part))
+        if row % chunk_rows == chunk_rows - 1:
+            write(("\n".join(chunk) + "\n").encode("ascii"))
+            chunk = []
+    chunk.append("</pre>\n</body>\n</html>\n")
+    write("\n".join(chunk).encode("ascii"))
+
+
+def ring_letters(starting_character, rings):
+    """
+        Return the letter of each of the given number of rings.
+    """
+    start_index = max(ALLOWED_CHARACTERS.find(starting_character), 0)
+    return [ALLOWED_CHARACTERS[(start_index + ring) % len(ALLOWED_CHARACTERS)] for ring in range(rings)]
+
+
+class SlicedJoin:
+    """
+        The space-joined string of a list of items, with O(1) slicing by item position.
+    """
+    def __init__(self, items):
+        self.text = " ".join(items)
+        self.starts = [0]  # starts[i]: where item i begins; the extra last entry is one past the end
+        for item in items:
+            self.starts.append(self.starts[-1] + len(item) + 1)
+
+    def slice(self, start, stop):
+        return self.text[self.starts[start]:self.starts[stop] - 1] if start < stop else ""
+
+    def head(self, count):
+        return self.slice(0, count)
+
+    def tail(self, count):
+        return self.slice(len(self.starts) - 1 - count, len(self.starts) - 1)
+
+
+def main(argv=None):
+    import argparse
+
+    color_names = {name.lower(): code for name, code in PALETTE_OPTIONS if code != "None"}
+    parser = argparse.ArgumentParser(description="Export an ASCII square to PNG, SVG or HTML.")
+    parser.add_argument("size", type=int)
+    parser.add_argument("output", help="destination file; the format is taken from its suffix")
+    parser.add_argument("--start", default="A", help="starting character (default: A)")
+    parser.add_argument("--mode", choices=EXPORT_MODES, default="one_color")
+    parser.add_argument("--color", choices=sorted(color_names), help="color of one-color squares (default: black)")
+    parser.add_argument("--scale", type=int, default=1, help="PNG pixels per glyph pixel (default: 1)")
+    arguments = parser.parse_args(argv)
+
+    from ascii_square_validation import validate_square_size, validate_starting_character
+
+    valid_size, error_size = validate_square_size(str(arguments.size))
+    valid_char, error_character = validate_starting_character(arguments.start)
+    if not valid_size or not valid_char:
+        parser.error(error_size if not valid_size else error_character)
+    if arguments.scale < 1:
+        parser.error("the scale must be a positive integer")
+    try:
+        export_square(arguments.size, arguments.start, arguments.output, mode=arguments.mode,
+                      color=color_names.get(arguments.color), scale=arguments.scale)
+    except ValueError as error:
+        parser.error(str(error))
+
+
+if __name__ == "__main__":
+    main()
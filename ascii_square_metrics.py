@@ -0,0 +1,135 @@
+import threading
+from collections import deque
+
+
+SAMPLE_WINDOW = 2048  # Most recent latencies kept per function for the percentiles
+
+
+class LatencyHistogram:
+    """
+        Latency statistics of one function: totals over all calls and percentiles over a window of recent calls.
+    """
+    def __init__(self, window=SAMPLE_WINDOW):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+        self.samples = deque(maxlen=window)
+
+    def add(self, elapsed_ns):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.min_ns = elapsed_ns if self.min_ns is None else min(self.min_ns, elapsed_ns)
+        self.max_ns = elapsed_ns if self.max_ns is None else max(self.max_ns, elapsed_ns)
+        self.samples.append(elapsed_ns)
+
+    def percentile(self, fraction):
+        """
+            Return the latency (ns) below which the given fraction of the recent samples fall.
+        """
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    def snapshot(self):
+        def in_ms(value_ns):
+            return value_ns / 1e6 if value_ns is not None else None
+
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else None,
+            "min_ms": in_ms(self.min_ns),
+            "max_ms": in_ms(self.max_ns),
+            "p50_ms": in_ms(self.percentile(0.50)),
+            "p95_ms": in_ms(self.percentile(0.95)),
+            "p99_ms": in_ms(self.percentile(0.99)),
+        }
+
+
+class MetricsRegistry:
+    """
+        Thread-safe store of per-function call metrics.
+        Cold (cache miss) and cached calls get separate latency histograms; the last call of each
+        function is also remembered per thread, so concurrent callers never see each other's timings.
+    """
+    def __init__(self, echo=False):
+        self.echo = echo  # Print one line per call, like the original timer did
+        self._lock = threading.Lock()
+        self._functions = {}  # name -> {"cold": LatencyHistogram, "cached": LatencyHistogram, "cache_info": callable}
+        self._local = threading.local()
+
+    def register(self, name, cache_info=None):
+        """
+            Make a function known to the registry; cache_info is the cache's own statistics callable, if any.
+        """
+        with self._lock:
+            entry = self._functions.setdefault(name, {"cold": LatencyHistogram(), "cached": LatencyHistogram(),
+                                                      "cache_info": None})
+            if cache_info is not None:
+                entry["cache_info"] = cache_info
+
+    def record(self, name, elapsed_ns, cached):
+        """
+            Record one call of a function that took elapsed_ns nanoseconds.
+        """
+        self.register(name)
+        with self._lock:
+            self._functions[name]["cached" if cached else "cold"].add(elapsed_ns)
+        if not hasattr(self._local, "last_calls"):
+            self._local.last_calls = {}
+        self._local.last_calls[name] = (elapsed_ns, cached)
+        if self.echo:
+            print(f"Execution time of {name}: {elapsed_ns / 1e9} seconds{' (cached)' if cached else ''}")
+
+    def last_execution_time(self, name):
+        """
+            Return the duration in seconds of the calling thread's last cold call of a function,
+            or None if that call was served from the cache (or there was no call yet).
+        """
+        elapsed_ns, cached = getattr(self._local, "last_calls", {}).get(name, (None, True))
+        return None if cached else elapsed_ns / 1e9
+
+    def snapshot(self):
+        """
+            Return a JSON-serializable dictionary of the metrics of every registered function.
+        """
+        with self._lock:
+            functions = dict(self._functions)
+            result = {name: {"cold": entry["cold"].snapshot(), "cached": entry["cached"].snapshot(),
+                             "cache_info": entry["cache_info"]} for name, entry in functions.items()}
+        for name, entry in result.items():
+            cache_info = entry["cache_info"]
+            # Hit and miss counters come from the cache itself rather than being inferred per call
+            entry["cache"] = cache_info()._asdict() if cache_info is not None else None
+            del entry["cache_info"]
+        return result
+
+    def export_json(self, destination=None, indent=2):
+        """
+            Return the snapshot as JSON text, writing it to destination (a path or a text file) when given.
+        """
+        import json  # Imported on demand to keep plain imports fast
+
+        text = json.dumps(self.snapshot(), indent=indent)
+        if destination is None:
+            return text
+        if hasattr(destination, "write"):
+            destination.write(text)
+        else:
+            with open(destination, "w", encoding="utf-8") as file:
+                file.write(text)
+        return text
+
+    def reset(self):
+        """
+            Forget all recorded calls, keeping the registered functions.
+        """
+        with self._lock:
+            for entry in self._functions.values():
+                entry["cold"] = LatencyHistogram()
+                entry["cached"] = LatencyHistogram()
+
+
+registry = MetricsRegistry()  # Process-wide registry used by timer_wrapper.timer
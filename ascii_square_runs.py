@@ -0,0 +1,130 @@
+import struct
+from functools import cached_property
+
+from ASCII_square import ALLOWED_CHARACTERS, mirrored_row, offset_character, square_offsets_and_map
+
+
+MAGIC = b"ASQR"
+RECORD = struct.Struct("<4sIc")  # magic, square size, starting character
+
+
+class CompactSquare:
+    """
+        Ring descriptor of a square: its size and starting character, which determine every cell.
+        Rows are described as runs of (character, length); row i has 2 * min(i, n - 1 - i) + 1 runs.
+        Text, rows and viewports are expanded lazily, so the descriptor can be cached or sent
+        between processes instead of the O(n²) text.
+    """
+    def __init__(self, square_size, starting_character="A"):
+        if square_size <= 0:
+            raise ValueError("Square size must be a positive integer.")
+        self.square_size = square_size
+        # Unknown starting characters fall back to "A", like ascii_square_construction does
+        self.starting_character = starting_character \
+            if len(starting_character) == 1 and starting_character in ALLOWED_CHARACTERS else ALLOWED_CHARACTERS[0]
+
+    @cached_property
+    def ascii_map(self):
+        return square_offsets_and_map(self.square_size, self.starting_character)[1]
+
+    def ring_character(self, ring):
+        """
+            Return the character of the given ring (0 is the border).
+        """
+        return offset_character(self.starting_character, ring)
+
+    def row_ring_runs(self, index):
+        """
+            Return row index as a list of (ring, length) runs.
+        """
+        if not 0 <= index < self.square_size:
+            raise IndexError(f"Row {index} is outside a square of size {self.square_size}.")
+        ring = min(index, self.square_size - 1 - index)
+        left = [(offset, 1) for offset in range(ring)]
+        return left + [(ring, self.square_size - 2 * ring)] + left[::-1]
+
+    def row_runs(self, index):
+        """
+            Return row index as a list of (character, length) runs.
+        """
+        return [(self.ring_character(ring), length) for ring, length in self.row_ring_runs(index)]
+
+    def row(self, index) -> str:
+        """
+            Return row index expanded to text ("c c ... c").
+        """
+        if not 0 <= index < self.square_size:
+            raise IndexError(f"Row {index} is outside a square of size {self.square_size}.")
+        return mirrored_row(min(index, self.square_size - 1 - index), self.square_size, self.ascii_map)
+
+    def rows(self, start=0, stop=None):
+        """
+            Yield rows start..stop-1 expanded to text.
+        """
+        stop = self.square_size if stop is None else min(stop, self.square_size)
+        for index in range(max(start, 0), stop):
+            yield self.row(index)
+
+    def text(self) -> str:
+        """
+            Return the whole square as text, identical to ascii_square_construction's result.
+        """
+        return "\n".join(self.rows())
+
+    def viewport_runs(self, first_row, first_column, rows, columns):
+        """
+            Return the runs of a rectangular window of the square, one list of (character, length)
+            per row, clipped to the square. Each row costs O(runs), not O(columns).
+        """
+        first_column, last_column = max(first_column, 0), min(first_column + columns, self.square_size)
+        window = []
+        for index in range(max(first_row, 0), min(first_row + rows, self.square_size)):
+            clipped = []
+            run_start = 0
+            for character, length in self.row_runs(index):
+                start, stop = max(run_start, first_column), min(run_start + length, last_column)
+                if start < stop:
+                    clipped.append((character, stop - start))
+                run_start += length
+            window.append(clipped)
+        return window
+
+    def to_bytes(self) -> bytes:
+        return RECORD.pack(MAGIC, self.square_size, self.starting_character.encode("ascii"))
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, square_size, starting_character = RECORD.unpack(data)
+        if magic != MAGIC:
+            raise ValueError("Data is not an encoded compact square.")
+        return cls(square_size, starting_character.decode("ascii"))
+
+    def __eq__(self, other):
+        return isinstance(other, CompactSquare) and (self.square_size, self.starting_character) == \
+            (other.square_size, other.starting_character)
+
+    def __hash__(self):
+        return hash((self.square_size, self.starting_character))
+
+    def __repr__(self):
+        return f"CompactSquare({self.square_size}, {self.starting_character!r})"
+
+
+def encode_square(square_text) -> CompactSquare:
+    """
+        Return the compact representation of a square's text, checking that the text really is a square.
+    """
+    square_size = square_text.count("\n") + 1
+    compact = CompactSquare(square_size, square_text[:1])
+    if compact.text() != square_text:
+        raise ValueError("Text is not an ASCII square.")
+    return compact
+
+
+def decode_square(compact) -> str:
+    """
+        Expand a compact square (or its bytes) back into the square's text.
+    """
+    if isinstance(compact, (bytes, bytearray, memoryview)):
+        compact = CompactSquare.from_bytes(compact)
+    return compact.text()
@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import json
+import time
+
+from ASCII_square import ALLOWED_CHARACTERS, ascii_square_construction, iter_rows
+from ascii_square_metrics import MetricsRegistry
+from ascii_square_validation import validate_square_size, validate_starting_character
+
+
+CHUNK_ROWS = 64  # Rows per write; each write waits for the transport to drain (backpressure)
+BUILD_SLOTS = 2  # Cold builds of cacheable squares that may run at once
+
+
+class SquareServer:
+    """
+        Local asyncio square service speaking a line protocol:
+            "<size> [<starting character>]"  ->  "OK <length>\\n" followed by exactly length bytes of square text
+            "STATS"                         ->  "OK <length>\\n" followed by a JSON document of counters
+            "QUIT"                          ->  closes the connection
+        Invalid requests get "ERROR <message>\\n"; request lines over 64 KiB also close the connection.
+        All connections share the process-wide square cache.
+        Cold builds run in the default thread pool so the event loop keeps serving other clients;
+        concurrent requests for the same size share one build, and squares too large for the cache
+        are streamed row by row instead of being built whole.
+    """
+    def __init__(self, chunk_rows=CHUNK_ROWS, build_slots=BUILD_SLOTS):
+        self.chunk_rows = chunk_rows
+        self.cache = ascii_square_construction.__wrapped__
+        self.builds = {}  # square_size -> shared future of the canonical square being built
+        self.build_slots = asyncio.Semaphore(build_slots)
+        self.metrics = MetricsRegistry()  # Request latencies, kept apart from the construction metrics
+        self.started = time.monotonic()
+        self.active_connections = 0
+        self.total_connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+
+    async def handle_connection(self, reader, writer):
+        self.active_connections += 1
+        self.total_connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):  # Longer than the StreamReader limit (64 KiB)
+                    self.requests += 1
+                    self.errors += 1
+                    await self.send_line(writer, "ERROR request line too long")
+                    break
+                if not line:
+                    break
+                command = line.decode("ascii", "replace").split()
+                if not command:
+                    continue
+                if command[0].upper() == "QUIT":
+                    break
+                if command[0].upper() == "STATS":
+                    await self.send_payload(writer, json.dumps(self.stats()).encode("ascii"))
+                else:
+                    await self.send_square(writer, command)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away mid-request
+        finally:
+            self.active_connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def send_square(self, writer, command):
+        """
+            Validate a square request, build (or fetch) the square off the event loop and stream it in chunks.
+        """
+        self.requests += 1
+        size_value = command[0]
+        char_value = command[1] if len(command) > 1 else "A"
+        valid_size, error_size = validate_square_size(size_value)
+        valid_char, error_character = validate_starting_character(char_value)
+        if not valid_size or not valid_char:
+            self.errors += 1
+            await self.send_line(writer, f"ERROR {error_size if not valid_size else error_character}")
+            return
+
+        start_time = time.perf_counter_ns()
+        square_size = int(size_value)
+        length = 2 * square_size * square_size - 1  # n rows of 2n - 1 characters and n - 1 newlines
+        canonical = self.cache.canonical(square_size)
+        cached = canonical is not None
+        if canonical is None and self.cache.fits(length):
+            canonical = await self.canonical_square(square_size)
+        await self.send_line(writer, f"OK {length}")
+        if canonical is not None:
+            await self.send_cached_square(writer, canonical, square_size, char_value)
+        else:
+            await self.stream_square(writer, square_size, char_value)
+        self.metrics.record("request", time.perf_counter_ns() - start_time, cached)
+
+    async def canonical_square(self, square_size):
+        """
+            Build the canonical square of a size in the thread pool, sharing one build between all
+            requests for that size. The square lands in the cache for the requests that follow.
+        """
+        build = self.builds.get(square_size)
+        if build is None:
+            build = asyncio.ensure_future(self.build_canonical(square_size))
+            self.builds[square_size] = build
+            build.add_done_callback(lambda _: self.builds.pop(square_size, None))
+        return await asyncio.shield(build)  # A client going away must not cancel the others' build
+
+    async def build_canonical(self, square_size):
+        async with self.build_slots:  # Bounds the squares being built at once, and so the memory they need
+            return await asyncio.get_running_loop().run_in_executor(None, ascii_square_construction,
+                                                                    square_size, ALLOWED_CHARACTERS[0])
+
+    async def send_cached_square(self, writer, canonical, square_size, starting_character):
+        """
+            Stream a square from its cached canonical form, translating one chunk at a time
+            so no full copy is made for other starting characters.
+        """
+        table = self.cache.tables.get(starting_character)  # None (unknown character) falls back to the first one
+        stride = 2 * square_size  # Characters per row including its separator
+        for first_row in range(0, square_size, self.chunk_rows):
+            chunk = canonical[first_row * stride:(first_row + self.chunk_rows) * stride]
+            if table is not None:
+                chunk = chunk.translate(table)
+            await self.send_chunk(writer, chunk.encode("ascii"))
+
+    async def stream_square(self, writer, square_size, starting_character):
+        """
+            Stream a square too large for the cache straight from iter_rows, so memory stays O(n).
+            Each chunk of rows is produced in the thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = square_chunks(square_size, starting_character, self.chunk_rows)
+        while (chunk := await loop.run_in_executor(None, next, chunks, None)) is not None:
+            await self.send_chunk(writer, chunk)
+
+    async def send_chunk(self, writer, chunk):
+        writer.write(chunk)
+        self.bytes_sent += len(chunk)
+        await writer.drain()
+
+    async def send_payload(self, writer, payload):
+        await self.send_line(writer, f"OK {len(payload)}")
+        await self.send_chunk(writer, payload)
+
+    async def send_line(self, writer, line):
+        data = (line + "\n").encode("ascii")
+        writer.write(data)
+        self.bytes_sent += len(data)
+        await writer.drain()
+
+    def stats(self):
+        """
+            Return the server's throughput, latency and cache counters.
+        """
+        uptime = time.monotonic() - self.started
+        request_metrics = self.metrics.snapshot().get("request", {})
+        return {
+            "uptime_s": uptime,
+            "active_connections": self.active_connections,
+            "total_connections": self.total_connections,
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "throughput_bytes_per_s": self.bytes_sent / uptime if uptime else 0.0,
+            "latency_cold": request_metrics.get("cold"),
+            "latency_cached": request_metrics.get("cached"),
+            "builds_in_flight": len(self.builds),
+            "cache": self.cache.cache_info()._asdict(),
+        }
+
+
+def square_chunks(square_size, starting_character, chunk_rows):
+    """
+        Yield the square as ASCII bytes, chunk_rows rows at a time, with the same separators as the whole square.
+    """
+    chunk = []
+    separator = ""  # Rows are separated by newlines, with no newline after the last row
+    for row in iter_rows(square_size, starting_character):
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield (separator + "\n".join(chunk)).encode("ascii")
+            separator = "\n"
+            chunk = []
+    if chunk:
+        yield (separator + "\n".join(chunk)).encode("ascii")
+async def serve(host="127.0.0.1", port=8765, path=None, chunk_rows=CHUNK_ROWS):
+    """
+        Serve squares on a TCP port, or on a UNIX socket when path is given, until cancelled.
+    """
+    server = SquareServer(chunk_rows)
+    if path is not None:
+        listener = await asyncio.start_unix_server(server.handle_connection, path=path)
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve ASCII squares over a local socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a UNIX socket instead of TCP")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    arguments = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.unix, arguments.chunk_rows))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
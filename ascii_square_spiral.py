@@ -0,0 +1,59 @@
+from array import array
+from math import isqrt
+
+
+def spiral_index(n, row, column):
+    """
+        Return the position of (row, column) in the clockwise spiral order of a square of size n, in O(1).
+    """
+    ring = min(row, column, n - 1 - row, n - 1 - column)
+    side = n - 2 * ring - 1  # Steps along one side of the ring
+    first = n * n - (side + 1) * (side + 1)  # Cells in the outer rings
+    if row == ring:
+        return first + column - ring
+    if column == n - 1 - ring:
+        return first + side + row - ring
+    if row == n - 1 - ring:
+        return first + 2 * side + (n - 1 - ring - column)
+    return first + 3 * side + (n - 1 - ring - row)
+
+
+def spiral_position(n, index):
+    """
+        Return the (row, column) at the given position of the clockwise spiral order of a square of size n, in O(1).
+    """
+    if not 0 <= index < n * n:
+        raise IndexError(f"Spiral index {index} is outside a square of size {n}.")
+    # The ring's width is the smallest width of n's parity whose square covers the cells left from index on
+    width = isqrt(n * n - index - 1) + 1
+    if (n - width) % 2:
+        width += 1
+    ring = (n - width) // 2
+    side = width - 1
+    offset = index - (n * n - width * width)
+    last = n - 1 - ring
+    if offset <= side:
+        return ring, ring + offset
+    if offset <= 2 * side:
+        return ring + offset - side, last
+    if offset <= 3 * side:
+        return last, last - (offset - 2 * side)
+    return last - (offset - 3 * side), ring
+
+
+def spiral_order(n):
+    """
+        Return the spiral order of a square of size n as an array('I') of linear indices (row * n + column).
+        Each side of each ring is an arithmetic progression, so the array is filled one range at a time.
+    """
+    order = array("I")
+    for ring in range((n + 1) // 2):
+        last = n - 1 - ring
+        if ring == last:
+            order.append(ring * n + ring)  # Center cell of an odd square
+            break
+        order.extend(range(ring * n + ring, ring * n + last + 1))  # Top, left to right
+        order.extend(range((ring + 1) * n + last, last * n + last + 1, n))  # Right, top to bottom
+        order.extend(range(last * n + last - 1, last * n + ring - 1, -1))  # Bottom, right to left
+        order.extend(range((last - 1) * n + ring, ring * n + ring, -n))  # Left, bottom to top
+    return order
@@ -0,0 +1,147 @@
+import mmap
+import os
+import struct
+import tempfile
+
+
+MAGIC = b"ASQ1"
+HEADER = struct.Struct("<4sII4x")  # magic, square size, starting character index, padding to 16 bytes
+FILE_SUFFIX = ".asq"
+
+
+class StoredSquare:
+    """
+        Memory-mapped square from a SquareStore.
+        Rows are stored with a fixed stride of 2 * square_size bytes ("c c ... c\\n"), so any row or
+        block of rows is a zero-copy memoryview into the mapping. Release the views before closing.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapping) < HEADER.size:  # Truncated file, too short to hold a header
+            self.mapping.close()
+            raise ValueError(f"{path} is not a stored square.")
+        magic, self.square_size, self.start_index = HEADER.unpack_from(self.mapping)
+        self.stride = 2 * self.square_size
+        if magic != MAGIC or len(self.mapping) != HEADER.size + self.square_size * self.stride:
+            self.mapping.close()
+            raise ValueError(f"{path} is not a stored square.")
+        self.data = memoryview(self.mapping)[HEADER.size:]
+
+    def row(self, index):
+        """
+            Return row index as a zero-copy view of its characters and separating spaces.
+        """
+        if not 0 <= index < self.square_size:
+            raise IndexError(f"Row {index} is outside a square of size {self.square_size}.")
+        return self.data[index * self.stride:(index + 1) * self.stride - 1]
+
+    def rows(self, start=0, stop=None):
+        """
+            Return rows start..stop-1 as one zero-copy view, each row ending with a newline.
+        """
+        stop = self.square_size if stop is None else min(stop, self.square_size)
+        return self.data[start * self.stride:stop * self.stride]
+
+    def text(self) -> str:
+        """
+            Return the whole square as text, identical to ascii_square_construction's result.
+        """
+        return str(self.data[:-1], "ascii")
+
+    def close(self):
+        self.data.release()
+        self.mapping.close()
+
+    def __len__(self):
+        return self.square_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SquareStore:
+    """
+        Directory of squares saved in a fixed-stride binary layout and memory-mapped on later requests.
+        Files are written to a temporary name and atomically renamed into place, so concurrent writers
+        (threads or processes) never expose partial files. The least recently used files are deleted
+        when the directory grows past max_bytes.
+    """
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, square_size, start_index):
+        return os.path.join(self.directory, f"square-{square_size}-{start_index}{FILE_SUFFIX}")
+
+    def get(self, square_size, start_index=0):
+        """
+            Return the stored square as a StoredSquare, or None if it is not in the store.
+        """
+        path = self.path(square_size, start_index)
+        try:
+            stored = StoredSquare(path)
+        except (FileNotFoundError, ValueError):  # Missing, empty (mmap refuses it), truncated or foreign
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except FileNotFoundError:
+            stored.close()  # Evicted by another process meanwhile
+            return None
+        return stored
+
+    def fits(self, square_size):
+        """
+            Whether the file of a square of this size fits the store's byte budget at all.
+        """
+        return HEADER.size + 2 * square_size * square_size <= self.max_bytes
+
+    def put(self, square_size, start_index, square_text):
+        """
+            Save a square's text to the store. Squares larger than the whole budget are not stored,
+            and put returns whether the square was stored.
+        """
+        if not self.fits(square_size):
+            return False
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(HEADER.pack(MAGIC, square_size, start_index))
+                file.write(square_text.encode("ascii"))
+                file.write(b"\n")  # Give the last row the same stride as the others
+            os.replace(temporary_path, self.path(square_size, start_index))
+        except BaseException:
+            try:
+                os.remove(temporary_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self.evict()
+        return True
+
+    def evict(self):
+        """
+            Delete the least recently used stored squares until the store fits its byte budget.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(FILE_SUFFIX):
+                try:
+                    status = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue  # Removed by another process
+                entries.append((status.st_mtime, status.st_size, name))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from ascii_square_metrics import LatencyHistogram
+
+
+MAX_TRACE_EVENTS = 100_000  # Oldest events are dropped beyond this, so tracing memory stays bounded
+MAX_GENERATIONS = 50  # Summaries of the most recent generations kept for the panel and the export
+
+
+class PipelineTracer:
+    """
+        Opt-in recorder of per-stage spans for each square generation, plus Tk event-loop lag
+        and animation frame times. Spans may be recorded from any thread.
+        export() writes the Chrome trace event format, which chrome://tracing and Perfetto can open.
+    """
+    def __init__(self, max_events=MAX_TRACE_EVENTS):
+        self.origin_ns = time.perf_counter_ns()
+        self.events = deque(maxlen=max_events)
+        self.generations = deque(maxlen=MAX_GENERATIONS)  # Finished generation summaries, oldest first
+        self.generation = None  # Summary of the generation in progress
+        self.loop_lag = LatencyHistogram()
+        self.frame_times = LatencyHistogram()
+        self.thread_ids = {}  # Thread name -> numeric trace thread id
+        self._lock = threading.Lock()
+
+    def begin_generation(self, generation_id, **details):
+        """
+            Start the trace of a new generation; an unfinished previous one is ended as superseded.
+        """
+        self.end_generation("superseded")
+        with self._lock:
+            self.generation = {"id": generation_id, "start_ns": time.perf_counter_ns(), "outcome": None,
+                               "details": details, "stages": {}, "marks": {}}
+
+    def end_generation(self, outcome="drawn"):
+        """
+            Finish the generation in progress, if any, recording how it ended.
+        """
+        with self._lock:
+            generation = self.generation
+            if generation is None:
+                return
+            self.generation = None
+            generation["outcome"] = outcome
+            generation["total_ms"] = (time.perf_counter_ns() - generation["start_ns"]) / 1e6
+            self.generations.append(generation)
+        self.events.append({"name": f"generation {generation['id']}", "ph": "i", "s": "g",
+                            "ts": self.timestamp(time.perf_counter_ns()), "pid": 1, "tid": self.thread_id("main"),
+                            "args": {"outcome": outcome}})
+
+    def current_generation(self):
+        generation = self.generation
+        return generation["id"] if generation is not None else None
+
+    @contextmanager
+    def span(self, name, thread="main", **details):
+        """
+            Time the enclosed block as a stage of the current generation.
+        """
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_span(name, start_ns, time.perf_counter_ns(), thread, **details)
+
+    def add_span(self, name, start_ns, end_ns, thread="main", generation=None, **details):
+        """
+            Record a stage that ran from start_ns to end_ns (perf_counter_ns) on the given thread.
+            Stages of the same name add up in the generation's summary.
+        """
+        with self._lock:
+            current = self.generation
+            if current is not None and (generation is None or generation == current["id"]):
+                stages = current["stages"]
+                stages[name] = stages.get(name, 0.0) + (end_ns - start_ns) / 1e6
+                details["generation"] = current["id"]
+        self.events.append({"name": name, "ph": "X", "ts": self.timestamp(start_ns),
+                            "dur": (end_ns - start_ns) / 1e3, "pid": 1, "tid": self.thread_id(thread), "args": details})
+
+    def mark(self, name):
+        """
+            Record a milestone of the current generation (e.g. first visible row), relative to its start.
+        """
+        now_ns = time.perf_counter_ns()
+        with self._lock:
+            current = self.generation
+            if current is not None:
+                current["marks"][name] = (now_ns - current["start_ns"]) / 1e6
+        self.events.append({"name": name, "ph": "i", "s": "t", "ts": self.timestamp(now_ns), "pid": 1,
+                            "tid": self.thread_id("main")})
+
+    def record_loop_lag(self, lag_ns):
+        """
+            Record how late a scheduled event-loop callback ran.
+        """
+        with self._lock:
+            self.loop_lag.add(lag_ns)
+        self.events.append({"name": "event loop lag", "ph": "C", "ts": self.timestamp(time.perf_counter_ns()),
+                            "pid": 1, "args": {"lag_ms": lag_ns / 1e6}})
+
+    def record_frame(self, start_ns, end_ns):
+        """
+            Record one animation frame that ran from start_ns to end_ns.
+        """
+        with self._lock:
+            self.frame_times.add(end_ns - start_ns)
+        self.events.append({"name": "animation frame", "ph": "X", "ts": self.timestamp(start_ns),
+                            "dur": (end_ns - start_ns) / 1e3, "pid": 1, "tid": self.thread_id("main"), "args": {}})
+
+    def thread_id(self, thread):
+        with self._lock:
+            return self.thread_ids.setdefault(thread, len(self.thread_ids) + 1)
+
+    def timestamp(self, counter_ns):
+        return (counter_ns - self.origin_ns) / 1e3  # Chrome traces count microseconds
+
+    def summary(self):
+        """
+            Return the recent generations with their stage totals and milestones, and the lag and frame statistics.
+        """
+        with self._lock:
+            generations = [{key: value for key, value in generation.items() if key != "start_ns"}
+                           for generation in self.generations]
+            return {
+                "generations": generations,
+                "event_loop_lag": self.loop_lag.snapshot(),
+                "animation_frames": self.frame_times.snapshot(),
+            }
+
+    def summary_text(self):
+        """
+            Return a short plain-text report of the last completed generation and the loop statistics.
+        """
+        summary = self.summary()
+        lines = []
+        # Superseded generations were cut short, so the latest one that ran to its end is shown
+        finished = [generation for generation in summary["generations"] if generation["outcome"] != "superseded"]
+        if finished:
+            generation = finished[-1]
+            lines.append(f"Generation {generation['id']} ({generation['outcome']}): {generation['total_ms']:.1f} ms")
+            for name, elapsed_ms in generation["stages"].items():
+                lines.append(f"  {name:<18} {elapsed_ms:10.2f} ms")
+            for name, at_ms in generation["marks"].items():
+                lines.append(f"  {name:<18} at {elapsed_ms_text(at_ms)}")
+        else:
+            lines.append("No generation traced yet.")
+        for label, statistics in (("Event-loop lag", summary["event_loop_lag"]),
+                                  ("Animation frames", summary["animation_frames"])):
+            if statistics["count"]:
+                lines.append(f"{label}: p50 {statistics['p50_ms']:.2f} ms, p95 {statistics['p95_ms']:.2f} ms, "
+                             f"max {statistics['max_ms']:.2f} ms ({statistics['count']} samples)")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        return {
+            # Thread names are metadata events, kept out of the bounded deque so they are never dropped
+            "traceEvents": [{"name": "thread_name", "ph": "M", "pid": 1, "tid": thread_id, "args": {"name": thread}}
+                            for thread, thread_id in list(self.thread_ids.items())] + list(self.events),
+            "displayTimeUnit": "ms",
+            "otherData": self.summary(),
+        }
+
+    def export(self, destination):
+        """
+            Write the trace as Chrome trace event JSON to a path or a text file object.
+        """
+        if isinstance(destination, str):
+            with open(destination, "w", encoding="utf-8") as file:
+                json.dump(self.chrome_trace(), file)
+        else:
+            json.dump(self.chrome_trace(), destination)
+
+
+def elapsed_ms_text(elapsed_ms):
+    return f"{elapsed_ms:.1f} ms" if elapsed_ms < 1000 else f"{elapsed_ms / 1000:.2f} s"
@@ -1,3 +1,11 @@
+from ASCII_square import FAST_ENGINE_AVAILABLE
+
+
+# The vectorized engine makes much larger squares practical
+MAX_SQUARE_SIZE = 20000 if FAST_ENGINE_AVAILABLE else 1000
+MAX_ALPHABET_LENGTH = 256
+
+
 def validate_square_size(value):
     """
         Validates that the given value can be converted to a positive integer.
@@ -7,16 +15,32 @@ def validate_square_size(value):
         size = int(value)
         if size <= 0:
             return False, "Size must be a positive integer."
-        if size > 1000:
-            return False, "Square size must be 1000 or less."
+        if size > MAX_SQUARE_SIZE:
+            return False, f"Square size must be {MAX_SQUARE_SIZE} or less."
         return True, ""
     except ValueError:
         return False, "Size must be a valid integer."
 
 
+def validate_rectangle_size(rows_value, columns_value):
+    """
+        Validates that the given rows and columns are positive integers no larger than the largest square's side.
+        Returns a tuple: (is_valid, error_message).
+    """
+    try:
+        rows, columns = int(rows_value), int(columns_value)
+    except ValueError:
+        return False, "Rows and columns must be valid integers."
+    if rows <= 0 or columns <= 0:
+        return False, "Rows and columns must be positive integers."
+    if rows > MAX_SQUARE_SIZE or columns > MAX_SQUARE_SIZE:
+        return False, f"Rows and columns must be {MAX_SQUARE_SIZE} or less."
+    return True, ""
+
+
 def validate_size_length(new_value):
-    # Allow only up to 4 characters in the square size entry
-    return len(new_value) <= 4
+    # Allow only as many characters as the largest allowed square size has digits
+    return len(new_value) <= len(str(MAX_SQUARE_SIZE))
 
 
 def validate_char_length(new_value):
@@ -24,11 +48,33 @@ def validate_char_length(new_value):
     return len(new_value) <= 1
 
 
-def validate_starting_character(value):
+def validate_starting_character(value, alphabet=None):
     """
-        Validates that the starting character is a single alphabetical character.
+        Validates that the starting character is a single alphabetical character,
+        or a character of the given custom alphabet.
         Returns a tuple: (is_valid, error_message).
     """
+    if alphabet is not None:
+        if len(value) != 1 or value not in alphabet:
+            return False, "Starting character must be a single character of the alphabet."
+        return True, ""
     if len(value) != 1 or not value.isalpha():
         return False, "Starting character must be a single alphabetic character."
     return True, ""
+
+
+def validate_alphabet(value):
+    """
+        Validates that a custom alphabet is non-empty, has no repeated characters and no whitespace,
+        which would be indistinguishable from the separators between characters and rows.
+        Returns a tuple: (is_valid, error_message).
+    """
+    if not value:
+        return False, "Alphabet must have at least one character."
+    if len(value) > MAX_ALPHABET_LENGTH:
+        return False, f"Alphabet must have {MAX_ALPHABET_LENGTH} characters or less."
+    if any(character.isspace() for character in value):
+        return False, "Alphabet must not contain whitespace."
+    if len(set(value)) != len(value):
+        return False, "Alphabet must not repeat characters."
+    return True, ""
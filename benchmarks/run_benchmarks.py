@@ -0,0 +1,242 @@
+"""
+    Benchmark suite for the construction, cache, export and rendering paths.
+
+        python benchmarks/run_benchmarks.py [--output results.json] [--baseline benchmarks/baseline.json]
+                                            [--threshold 1.5] [--write-baseline] [--quick]
+
+    Every case is run untimed a few times first, then reports the minimum and median wall time
+    and the peak traced memory.
+    With a baseline, cases whose minimum time or peak memory exceed threshold times their baseline
+    are reported as regressions and the script exits with status 1, as it does when a baseline case was measured
+    with other repeat or warm-up counts. Rendering cases need a display and are skipped without one.
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ASCII_square import FAST_ENGINE_AVAILABLE, ascii_square_construction  # noqa: E402
+from ascii_square_validation import MAX_SQUARE_SIZE, validate_square_size, validate_starting_character  # noqa: E402
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+WARMUP_RUNS = 2  # Untimed runs before timing, so imports, caches and the CPU clock have settled
+
+
+def measure(function, repeat, setup=None, warmup=WARMUP_RUNS):
+    """
+        Run function warmup times untimed, then repeat times (calling setup before each run, untimed),
+        and return its timings and the peak memory of one extra traced run.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        function()
+
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start_time = time.perf_counter_ns()
+        function()
+        timings.append(time.perf_counter_ns() - start_time)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "repeat": repeat,
+        "warmup": warmup,
+        "min_ms": min(timings) / 1e6,
+        "median_ms": statistics.median(timings) / 1e6,
+        "peak_kib": peak / 1024,
+    }
+
+
+def construction_cases(quick):
+    sizes = [1, 10, 100, 500, 1000]
+    if FAST_ENGINE_AVAILABLE and not quick:
+        sizes += [5000, MAX_SQUARE_SIZE // 2]
+    cases = {}
+    for size in sizes:
+        repeat = 3 if size > 1000 else 10
+        cases[f"construction_cold[{size}]"] = measure(lambda: ascii_square_construction(size, "A"), repeat,
+                                                      setup=ascii_square_construction.cache_clear)
+        ascii_square_construction(size, "A")
+        cases[f"construction_warm[{size}]"] = measure(lambda: ascii_square_construction(size, "A"), repeat)
+        cases[f"construction_derived[{size}]"] = measure(lambda: ascii_square_construction(size, "q"), repeat)
+        ascii_square_construction.cache_clear()
+    return cases
+
+
+def validator_cases():
+    values = ["13", "1000", "0", "abc", "99999"]
+    characters = ["A", "z", "", "1", "ab"]
+    # Each run is only a few milliseconds, so more runs are timed for a stable minimum
+    return {
+        "validate_square_size": measure(lambda: [validate_square_size(value) for value in values * 2000], 30),
+        "validate_starting_character":
+            measure(lambda: [validate_starting_character(value) for value in characters * 2000], 30),
+    }
+
+
+def spiral_cases(quick):
+    try:
+        from ascii_square_application import AsciiSquareApp
+    except ImportError:  # tkinter is not installed
+        return {}
+    cases = {}
+    for size in [10, 100] if quick else [10, 100, 1000]:
+        cases[f"spiral_order[{size}]"] = measure(lambda: AsciiSquareApp.get_spiral_order(size), 5,
+                                                 setup=AsciiSquareApp.get_spiral_order.cache_clear)
+    return cases
+
+
+def export_cases(quick):
+    from ascii_square_export import export_square
+
+    class Sink:
+        def write(self, data):
+            pass
+
+    cases = {}
+    for size in [100] if quick else [100, 1000]:
+        for export_format in ("png", "svg", "html"):
+            cases[f"export_{export_format}[{size}]"] = \
+                measure(lambda: export_square(size, "A", Sink(), export_format, mode="alternating"), 3)
+    return cases
+
+
+def rendering_cases(quick):
+    """
+        Time drawing and snake frames on a real (possibly virtual, e.g. Xvfb) display.
+    """
+    try:
+        from ascii_square_application import AsciiSquareApp
+        from ascii_square_runs import CompactSquare
+        app = AsciiSquareApp()
+    except Exception as error:  # tkinter is missing, or there is no display (tkinter.TclError)
+        return {"skipped": str(error)}
+
+    app.withdraw()
+    palette_list = [code for _, code in app.palette_options if code != "None"]
+    cases = {}
+
+    def draw(size, alternating, snake):
+        app.current_square_size = size
+        app.current_starting_character = "A"
+        app.current_compact_square = CompactSquare(size, "A")
+        app.draw_square(ascii_square_construction(size, "A"), alternating, snake, palette_list, None)
+        while app.draw_job_id is not None:  # Run the event loop until the incremental drawing is done
+            app.update()
+        app.update_idletasks()
+
+    for size in [13, 50] if quick else [13, 50, 100, 1000]:
+        for mode, alternating, snake in (("one_color", False, False), ("alternating", True, False),
+                                         ("snake", False, True)):
+            cases[f"draw_square[{mode},{size}]"] = measure(lambda: draw(size, alternating, snake), 3)
+            cases[f"draw_square[{mode},{size}]"]["items"] = len(app.canvas.find_all())
+            if snake:
+                cases[f"snake_frame[{size}]"] = measure(lambda: (app.animate_snake(palette_list, size),
+                                                                 app.update_idletasks()), 10)
+            if app.snake_animation_id is not None:
+                app.after_cancel(app.snake_animation_id)
+                app.snake_animation_id = None
+    app.destroy()
+    return cases
+
+
+def run(quick=False):
+    results = {}
+    results.update(construction_cases(quick))
+    results.update(validator_cases())
+    results.update(spiral_cases(quick))
+    results.update(export_cases(quick))
+    rendering = rendering_cases(quick)
+    skipped = rendering.pop("skipped", None)
+    results.update(rendering)
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fast_engine": FAST_ENGINE_AVAILABLE,
+            "rendering_skipped": skipped,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """
+        Return the regressions, as (case, metric, current, baseline) for every case whose minimum time or peak memory
+        exceeds threshold times its baseline value, and the cases whose baseline was measured with other repeat or
+        warm-up counts and so cannot be compared. Minimum times are compared because they are the least noisy.
+    """
+    regressions = []
+    stale = []
+    for name, result in report["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        # Baselines written before warm-up runs were added have no warmup entry
+        if (reference["repeat"], reference.get("warmup", 0)) != (result["repeat"], result["warmup"]):
+            stale.append(name)
+            continue
+        # Floors keep millisecond and few-KiB noise from counting as regressions
+        for metric, floor in (("min_ms", 5.0), ("peak_kib", 64)):
+            if result[metric] > threshold * max(reference[metric], floor):
+                regressions.append((name, metric, result[metric], reference[metric]))
+    return regressions, stale
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the ASCII square benchmarks.")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="report cases whose minimum time or peak memory exceed this multiple of the baseline")
+    parser.add_argument("--write-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--quick", action="store_true", help="run only the small cases")
+    arguments = parser.parse_args(argv)
+
+    report = run(arguments.quick)
+    for name, result in report["results"].items():
+        print(f"{name:45} min {result['min_ms']:10.3f} ms   median {result['median_ms']:10.3f} ms   "
+              f"peak {result['peak_kib']:12.1f} KiB")
+    if report["environment"]["rendering_skipped"]:
+        print(f"rendering cases skipped: {report['environment']['rendering_skipped']}")
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if arguments.write_baseline:
+        with open(arguments.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        return 0
+
+    if not os.path.exists(arguments.baseline):
+        return 0
+    with open(arguments.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions, stale = compare(report, baseline, arguments.threshold)
+    for name, metric, current, reference in regressions:
+        print(f"REGRESSION {name} {metric}: {current:.3f} vs baseline {reference:.3f}")
+    for name in stale:
+        print(f"STALE BASELINE {name}: measured with other repeat or warm-up counts, refresh with --write-baseline")
+    return 1 if regressions or stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ASCII_square  # noqa: E402
+from ASCII_square import build_square, configure_square_store, stored_square  # noqa: E402
+from ascii_square_store import HEADER, SquareStore  # noqa: E402
+
+
+class SquareStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(configure_square_store, None)
+        ASCII_square.ascii_square_construction.cache_clear()
+
+    def test_truncated_file_is_a_miss(self):
+        store = SquareStore(self.directory.name)
+        for content in (b"", b"ASQ", HEADER.pack(b"ASQ1", 3, 0)[:HEADER.size - 1]):
+            with open(store.path(3, 0), "wb") as file:
+                file.write(content)
+            self.assertIsNone(store.get(3, 0))
+
+    def test_truncated_file_is_replaced(self):
+        configure_square_store(self.directory.name)
+        with open(ASCII_square.square_store.path(5, 0), "wb") as file:
+            file.write(b"ASQ")
+        with stored_square(5) as stored:
+            self.assertEqual(stored.text(), build_square(5))
+
+    def test_square_over_budget_raises(self):
+        configure_square_store(self.directory.name, 100)
+        with self.assertRaises(ValueError):
+            stored_square(20)
+        self.assertFalse(ASCII_square.square_store.put(20, 0, build_square(20)))
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_square_within_budget_is_mapped(self):
+        configure_square_store(self.directory.name, 100)
+        with stored_square(6, "c") as stored:
+            self.assertEqual(stored.text(), build_square(6, "c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,23 +1,46 @@
+import threading
 import time
 from functools import wraps
 
+from ascii_square_metrics import registry
+
+
+_cold_calls = threading.local()  # Per-thread flag set by cold_path when the wrapped computation really runs
+
 
 def timer(function):
-    @wraps(function)
+    """
+        Time every call of function with perf_counter_ns and record it in the metrics registry.
+        For cached functions, put cold_path under the cache so each call is classified as a hit or a miss
+        by whether the computation ran on the calling thread. The cache's cache_info and cache_clear
+        are exposed on the returned wrapper.
+    """
+    name = function.__name__
+    registry.register(name, getattr(function, "cache_info", None))
+
+    @wraps(function, updated=())  # Caches are objects; copying their __dict__ would expose stale counters
     def wrapper(*args, **kwargs):
-        info_before = function.cache_info().misses
-        start_time = time.time()
+        _cold_calls.ran = False
+        start_time = time.perf_counter_ns()
         result = function(*args, **kwargs)
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        info_after = function.cache_info().misses
-
-        if info_after == info_before:        # If misses did not change, this was a cache hit.
-            wrapper.last_execution_time = None
-        else:
-            wrapper.last_execution_time = elapsed_time
-        print(f"Execution time of {function.__name__}: {elapsed_time} seconds")
+        elapsed_ns = time.perf_counter_ns() - start_time
+        cached = hasattr(function, "cache_info") and not _cold_calls.ran
+        registry.record(name, elapsed_ns, cached)
         return result
 
-    wrapper.last_execution_time = None
+    if hasattr(function, "cache_info"):
+        wrapper.cache_info = function.cache_info
+        wrapper.cache_clear = function.cache_clear
+    return wrapper
+
+
+def cold_path(function):
+    """
+        Mark the uncached computation of a function decorated with timer and a cache.
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        _cold_calls.ran = True
+        return function(*args, **kwargs)
+
     return wrapper